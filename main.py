@@ -1,18 +1,58 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import (
+    HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
+)
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ValidationError
+from typing import Any, List, Literal, Optional
+import httpx
 import uvicorn
 import json
 import os
+import asyncio
+import logging
+import mmap
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 으로 대체 (느리지만 결과는 같음)
+    orjson = None
+
+# 기본 응답 클래스 (orjson 이 있으면 ORJSONResponse)
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """백그라운드 저널 flush/스냅샷 갱신을 시작하고, 종료 시 저널을 스냅샷에 반영합니다."""
+    global _journal_dirty
+    _journal_dirty = asyncio.Event()
+    flusher = asyncio.create_task(_flush_journals_coalesced())
+    compactor = asyncio.create_task(_compact_periodically())
+    try:
+        yield
+    finally:
+        flusher.cancel()
+        compactor.cancel()
+        _journal_dirty = None
+        close_stores()
+
+
 # FastAPI 인스턴스 생성
 app = FastAPI(
     title="주식 종목 관리 API",
     description="주식 종목 정보를 관리하는 FastAPI 애플리케이션",
     version="1.0.0",
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,9 +63,72 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 목록 조회 응답(JSON)은 반복되는 키가 많아 압축 효율이 좋습니다. 1KB 미만 응답은 압축하지 않습니다.
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 STOCKS_FILE = "stocks.json"
 TRADING_CONFIGS_FILE = "trading_configs.json"
 TRADE_HISTORY_FILE = "tradingBot/trade_history.json"
+
+# 변경 내역은 JSONL 저널에 추가하고, 주기적으로 스냅샷(JSON)에 반영합니다.
+# 자동매매 봇이 trading_configs.json 을 직접 읽으므로 주기를 짧게 유지합니다.
+STOCKS_LOG_FILE = "stocks.log"
+TRADING_CONFIGS_LOG_FILE = "trading_configs.log"
+COMPACT_INTERVAL_SECONDS = 2
+# 짧은 시간에 몰린 저널 기록은 모아서 한 번에 flush 합니다.
+JOURNAL_FLUSH_DELAY = 0.05
+
+# 파일 읽기/쓰기 버퍼 크기 (기본 8 KiB 대신 64 KiB 로 시스템 콜 수를 줄임)
+IO_BUFFER_SIZE = 1 << 16
+# 목록 응답이 이 건수를 넘으면 한 번에 직렬화하지 않고 나눠서 스트리밍합니다.
+STREAM_THRESHOLD = 1000
+STREAM_CHUNK_SIZE = 256
+# 이 크기 이상인 파일은 mmap 으로 읽어 중간 bytes 복사를 피합니다. (작은 파일은 read 가 더 빠름)
+MMAP_MIN_SIZE = 4096
+
+# 파싱된 JSON 데이터 캐시 (파일 mtime/크기가 바뀔 때만 다시 읽음)
+# by_id / by_code 는 리스트 위치(index), by_market 은 대문자 시장명별 주식 dict 참조 목록,
+# by_user 는 설정 dict 참조 목록, by_key 는 (user_id, stock_code, strategy_type) 별 설정 dict 입니다.
+# max_id 는 지금까지 사용된 가장 큰 ID 로, 삭제해도 줄어들지 않습니다. (ID 재사용 방지)
+# version 은 데이터가 바뀔 때마다 증가하며 목록 조회의 ETag 로 쓰입니다.
+# by_id_bytes 는 단건 조회 시 직렬화한 주식 JSON 을 ID 별로 보관하며, 변경된 항목만 지웁니다.
+_cache_lock = threading.RLock()
+_snapshot_lock = threading.Lock()  # 스냅샷 파일 쓰기 직렬화
+# 서버 실행 중(lifespan)에만 설정되며, 저널 flush 가 필요함을 백그라운드 작업에 알립니다.
+_journal_dirty = None
+_journal_batch_depth = 0  # journal_batch() 블록 중첩 수
+_ETAG_PREFIX = os.urandom(4).hex()  # 프로세스별 ETag 접두어
+_stocks_cache = {
+    "path": STOCKS_FILE, "log_path": STOCKS_LOG_FILE, "log": None, "pending": 0,
+    "stat": None, "data": None, "by_id": {}, "by_code": {}, "by_market": {}, "max_id": 0,
+    "version": 0, "by_id_bytes": {},
+}
+_configs_cache = {
+    "path": TRADING_CONFIGS_FILE, "log_path": TRADING_CONFIGS_LOG_FILE, "log": None, "pending": 0,
+    "stat": None, "data": None, "by_id": {}, "by_user": {}, "by_key": {}, "max_id": 0,
+    "version": 0,
+}
+
+
+if orjson is not None:
+    # 파일 저장 시 기존 json.dump(indent=2) 포맷을 유지합니다.
+    JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj, pretty=False):
+        """객체를 JSON bytes 로 직렬화합니다. pretty=True 이면 파일 저장용 들여쓰기 포맷입니다."""
+        return orjson.dumps(obj, option=JSON_DUMP_OPTIONS if pretty else 0)
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj, pretty=False):
+        """객체를 JSON bytes 로 직렬화합니다. pretty=True 이면 파일 저장용 들여쓰기 포맷입니다."""
+        if pretty:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 class Stock(BaseModel):
     id: Optional[int] = None
     code: str
@@ -58,60 +161,552 @@ class AutoTradingConfig(BaseModel):
     is_active: bool = True
 
 
+def json_body(model):
+    """요청 본문을 model 로 변환하는 의존성을 만듭니다.
+
+    JSON 파싱과 검증을 pydantic-core 에서 한 번에 처리하므로
+    FastAPI 기본 경로(json.loads 후 dict 검증)보다 중간 객체 생성이 적습니다.
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+
+    return parse
+
+
+def json_body_openapi(model):
+    """json_body 를 쓰는 엔드포인트도 문서에 요청 본문 스키마가 보이도록 합니다."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": f"#/components/schemas/{model.__name__}"}}
+            },
+        }
+    }
+
+
+parse_stock = json_body(Stock)
+parse_trading_config = json_body(AutoTradingConfig)
+
+
+class StockBatchOp(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None  # update / delete 대상 ID
+    payload: Optional[Stock] = None  # create / update 데이터
+
+
+class BulkRequest(BaseModel):
+    method: Literal["GET", "POST", "PUT", "DELETE"]
+    path: str  # 쿼리 문자열 포함 가능 (예: /trading-configs/u1?strategy_type=mtt)
+    body: Optional[Any] = None  # POST / PUT 요청 본문
+
+
+class TradingConfigBatchOp(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None  # update / delete 대상 ID
+    payload: Optional[AutoTradingConfig] = None  # create / update 데이터
+
+
+def _index_stocks(cache):
+    """주식 데이터의 id/종목코드/시장 인덱스를 다시 만듭니다."""
+    data = cache["data"]
+    cache["by_id"] = {stock["id"]: i for i, stock in enumerate(data)}
+    cache["by_code"] = {stock["code"]: i for i, stock in enumerate(data)}
+    cache["by_id_bytes"] = {}
+    _index_stocks_by_market(cache)
+    _track_max_id(cache)
+
+
+def _index_stocks_by_market(cache):
+    """대문자 시장명별 주식 목록(원래 순서 유지)을 다시 만듭니다."""
+    by_market = defaultdict(list)
+    for stock in cache["data"]:
+        by_market[stock["market"].upper()].append(stock)
+    cache["by_market"] = by_market
+
+
+def _config_key(config):
+    """(user_id, stock_code, strategy_type) 인덱스 키를 만듭니다."""
+    return (config["user_id"], config["stock_code"], config.get("strategy_type", "mtt"))
+
+
+def _index_trading_configs(cache):
+    """자동매매 설정의 id/사용자/(사용자, 종목, 전략) 인덱스를 다시 만듭니다."""
+    data = cache["data"]
+    cache["by_id"] = {config["id"]: i for i, config in enumerate(data)}
+    by_user = defaultdict(list)
+    by_key = {}
+    for config in data:
+        by_user[config["user_id"]].append(config)
+        by_key.setdefault(_config_key(config), config)  # 중복 시 기존처럼 먼저 나온 설정
+    cache["by_user"] = by_user
+    cache["by_key"] = by_key
+    _track_max_id(cache)
+
+
+def _track_max_id(cache):
+    """데이터의 가장 큰 ID 를 max_id 에 반영합니다. (줄어들지 않음)"""
+    cache["max_id"] = max(cache["max_id"], max((r["id"] for r in cache["data"]), default=0))
+
+
+def _replay_journal(log_path, data):
+    """스냅샷 이후 저널(JSONL)에 기록된 변경 내역을 data 에 다시 적용합니다.
+
+    Returns:
+        (적용된 데이터, 적용한 변경 건수)
+    """
+    try:
+        with open(log_path, "rb", buffering=IO_BUFFER_SIZE) as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return data, 0
+    if not lines:
+        return data, 0
+    positions = {record["id"]: i for i, record in enumerate(data)}
+    for line in lines:
+        try:
+            entry = json_loads(line)
+        except json.JSONDecodeError:
+            break  # 비정상 종료로 잘린 마지막 줄
+        if entry["op"] == "upsert":
+            record = entry["record"]
+            i = positions.get(record["id"])
+            if i is None:
+                positions[record["id"]] = len(data)
+                data.append(record)
+            else:
+                data[i] = record
+        elif entry["op"] == "delete":
+            # 서버의 _swap_pop 과 같이 마지막 항목을 빈 자리로 옮겨 목록 순서를 맞춥니다.
+            i = positions.pop(entry["id"], None)
+            if i is not None:
+                last = data.pop()
+                if i < len(data):
+                    data[i] = last
+                    positions[last["id"]] = i
+    return data, len(lines)
+
+
+def read_json_file(path):
+    """JSON 파일을 읽어 파싱합니다. 큰 파일은 mmap 버퍼를 orjson 에 바로 넘깁니다."""
+    with open(path, "rb", buffering=IO_BUFFER_SIZE) as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return json_loads(view)
+
+
+def _stat_key(path):
+    """캐시 유효성 확인용 (mtime_ns, 크기) 를 반환합니다. 파일이 없으면 None."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # mtime 해상도가 낮은 파일시스템에서도 같은 시각의 변경을 크기로 구분합니다.
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _fill_defaults(data, model):
+    """저장 데이터에 없는 필드를 모델 기본값으로 채웁니다. (예전 형식 데이터 호환)
+
+    목록 응답은 response_model 검증을 거치지 않으므로, 파일을 읽을 때 한 번만 채웁니다.
+    """
+    defaults = {
+        name: field.get_default(call_default_factory=True)
+        for name, field in model.model_fields.items()
+        if not field.is_required()
+    }
+    for record in data:
+        for name, default in defaults.items():
+            if name not in record:
+                record[name] = list(default) if isinstance(default, list) else default
+    return data
+
+
+def _load_cached(cache, reindex, model):
+    """파일 mtime/크기가 바뀐 경우에만 스냅샷과 저널을 다시 읽고, 아니면 캐시를 반환합니다."""
+    with _cache_lock:
+        stat = _stat_key(cache["path"])
+        if cache["data"] is not None and stat == cache["stat"]:
+            return cache["data"]
+        data = []
+        if stat is not None:
+            try:
+                data = read_json_file(cache["path"])
+            except (json.JSONDecodeError, FileNotFoundError):
+                data = []
+        _flush_journal(cache)
+        data, replayed = _replay_journal(cache["log_path"], data)
+        cache["pending"] = max(cache["pending"], replayed)
+        cache["stat"] = stat
+        cache["data"] = _fill_defaults(data, model)
+        cache["version"] += 1
+        reindex(cache)
+        return data
+
+
+async def _load_cached_async(cache, reindex, model):
+    """캐시가 최신이면 바로 반환하고, 파일을 다시 파싱해야 할 때만 스레드 풀에서 읽습니다.
+
+    캐시 적중 시에는 stat 한 번으로 끝나므로 스레드 전환 비용도 들지 않습니다.
+    """
+    if cache["data"] is not None and _stat_key(cache["path"]) == cache["stat"]:
+        return cache["data"]
+    return await asyncio.to_thread(_load_cached, cache, reindex, model)
+
+
+def _write_snapshot(cache):
+    """캐시 데이터를 스냅샷 JSON 파일로 저장하고 반영된 저널 내역을 비웁니다.
+
+    임시 파일에 쓰고 fsync 한 뒤 os.replace 로 교체하므로, 쓰는 도중이나 직후에
+    종료되어도 스냅샷이 깨지거나 비지 않습니다. (저널을 비우기 전에 반드시 디스크에 기록)
+    _cache_lock 안에서는 목록을 얕게 복사만 하고 직렬화와 파일 쓰기는 락 밖에서 하므로,
+    이벤트 루프의 변경 처리를 막지 않으며 그동안 들어온 변경은 저널에 남습니다.
+    (레코드는 제자리에서 수정하지 않고 새 dict 로 교체하므로 얕은 복사로 충분합니다.)
+    """
+    with _snapshot_lock:
+        with _cache_lock:
+            records = list(cache["data"])
+            _flush_journal(cache)
+            log = cache["log"]
+            mark = os.fstat(log.fileno()).st_size if log is not None else 0
+            compacted = cache["pending"]
+
+        payload = json_dumps(records, pretty=True)
+        tmp_path = cache["path"] + ".tmp"
+        with open(tmp_path, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with _cache_lock:
+            os.replace(tmp_path, cache["path"])
+            cache["stat"] = _stat_key(cache["path"])
+            log = cache["log"]
+            if log is not None:
+                # 스냅샷 직렬화 이후에 추가된 저널 내역만 남깁니다.
+                log.flush()
+                tail = b""
+                if os.fstat(log.fileno()).st_size > mark:
+                    with open(cache["log_path"], "rb") as f:
+                        f.seek(mark)
+                        tail = f.read()
+                log.truncate(0)
+                log.write(tail)
+                log.flush()
+            elif os.path.exists(cache["log_path"]):
+                os.remove(cache["log_path"])
+            cache["pending"] -= compacted
+
+
+def _save_cached(cache, data, reindex):
+    """JSON 파일을 저장하고 캐시를 저장된 데이터로 갱신합니다."""
+    with _cache_lock:
+        if data is not cache["data"]:
+            cache["data"] = data
+            reindex(cache)
+        cache["version"] += 1
+    _write_snapshot(cache)
+
+
+def _flush_journal(cache):
+    """버퍼에 남아 있는 저널 기록을 파일로 내보냅니다."""
+    if cache["log"] is not None:
+        cache["log"].flush()
+
+
+def _journal(cache, entry):
+    """변경 내역 한 건을 저널 파일 끝에 추가합니다. (전체 파일을 다시 쓰지 않음)
+
+    서버 실행 중에는 바로 flush 하지 않고 JOURNAL_FLUSH_DELAY 동안 모아서 flush 합니다.
+    """
+    log = cache["log"]
+    if log is None:
+        log = cache["log"] = open(cache["log_path"], "ab", buffering=IO_BUFFER_SIZE)
+    log.write(json_dumps(entry) + b"\n")
+    cache["pending"] += 1
+    cache["version"] += 1
+    if _journal_dirty is not None:
+        _journal_dirty.set()
+    elif not _journal_batch_depth:
+        log.flush()
+
+
+@contextmanager
+def journal_batch():
+    """블록 안의 저널 기록을 모아 두었다가 블록이 끝날 때 한 번만 flush 합니다."""
+    global _journal_batch_depth
+    with _cache_lock:
+        _journal_batch_depth += 1
+    try:
+        yield
+    finally:
+        with _cache_lock:
+            _journal_batch_depth -= 1
+            if not _journal_batch_depth:
+                flush_journals()
+
+
+def flush_journals():
+    """두 저장소의 저널 버퍼를 모두 flush 합니다."""
+    with _cache_lock:
+        for cache in (_stocks_cache, _configs_cache):
+            _flush_journal(cache)
+
+
+def compact_stores():
+    """저널에 쌓인 변경 내역을 스냅샷 파일에 반영합니다."""
+    for cache in (_stocks_cache, _configs_cache):
+        if cache["pending"]:
+            _write_snapshot(cache)
+
+
+def close_stores():
+    """스냅샷을 최신 상태로 만들고 저널 파일을 닫습니다."""
+    compact_stores()
+    with _cache_lock:
+        for cache in (_stocks_cache, _configs_cache):
+            if cache["log"] is not None:
+                cache["log"].close()
+                cache["log"] = None
+
+
+def sync_journal(cache):
+    """저널 파일을 fsync 하여 지금까지의 변경 내역을 디스크에 기록합니다."""
+    with _cache_lock:
+        if cache["log"] is not None:
+            cache["log"].flush()
+            os.fsync(cache["log"].fileno())
+
+
+async def sync_journal_async(cache):
+    """이벤트 루프를 막지 않도록 스레드 풀에서 저널을 fsync 합니다."""
+    await asyncio.to_thread(sync_journal, cache)
+
+
+async def _flush_journals_coalesced():
+    """저널 기록이 생기면 JOURNAL_FLUSH_DELAY 만큼 기다렸다가 한 번에 flush 합니다."""
+    while True:
+        await _journal_dirty.wait()
+        await asyncio.sleep(JOURNAL_FLUSH_DELAY)
+        _journal_dirty.clear()
+        flush_journals()
+
+
+async def _compact_periodically():
+    """COMPACT_INTERVAL_SECONDS 마다 스레드 풀에서 스냅샷을 갱신합니다."""
+    while True:
+        await asyncio.sleep(COMPACT_INTERVAL_SECONDS)
+        await asyncio.to_thread(compact_stores)
+
+
 def load_stocks():
     """JSON 파일에서 주식 데이터를 로드합니다."""
-    if not os.path.exists(STOCKS_FILE):
-        return []
-    try:
-        with open(STOCKS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    return _load_cached(_stocks_cache, _index_stocks, Stock)
+
+
+async def load_stocks_async():
+    """load_stocks 의 비동기 버전입니다. (핸들러용)"""
+    return await _load_cached_async(_stocks_cache, _index_stocks, Stock)
 
 
 def save_stocks(stocks_data):
     """주식 데이터를 JSON 파일에 저장합니다."""
-    with open(STOCKS_FILE, "w", encoding="utf-8") as f:
-        json.dump(stocks_data, f, ensure_ascii=False, indent=2)
+    _save_cached(_stocks_cache, stocks_data, _index_stocks)
+
+
+# 아래 변경 함수들은 이벤트 루프에서 await 없이 호출되므로, 핸들러가 load 와 변경 사이에
+# await 하지 않는 한 요청 간 lost update 가 생기지 않습니다. (스레드와는 _cache_lock 으로 동기화)
+# 그 사이 다른 스레드가 파일을 다시 읽어 목록과 인덱스를 교체했을 수 있으므로, 대상 목록과
+# 위치는 핸들러가 받은 것을 쓰지 않고 _cache_lock 안에서 캐시와 id 로 다시 찾습니다.
+def append_stock(stock_dict):
+    """주식 데이터를 추가하고 인덱스와 저널을 갱신합니다."""
+    with _cache_lock:
+        stocks_data = _stocks_cache["data"]
+        _stocks_cache["by_id"][stock_dict["id"]] = len(stocks_data)
+        _stocks_cache["by_code"][stock_dict["code"]] = len(stocks_data)
+        _stocks_cache["by_market"][stock_dict["market"].upper()].append(stock_dict)
+        _stocks_cache["max_id"] = max(_stocks_cache["max_id"], stock_dict["id"])
+        _stocks_cache["by_id_bytes"].pop(stock_dict["id"], None)
+        stocks_data.append(stock_dict)
+        _journal(_stocks_cache, {"op": "upsert", "record": stock_dict})
+
+
+def replace_stock(stock_dict):
+    """같은 id 의 주식 데이터를 교체하고 종목코드/시장 인덱스와 저널을 갱신합니다.
+
+    Returns:
+        교체했으면 True, 해당 id 가 없으면 False
+    """
+    with _cache_lock:
+        stocks_data = _stocks_cache["data"]
+        index = _stocks_cache["by_id"].get(stock_dict["id"])
+        if index is None:
+            return False
+        by_code = _stocks_cache["by_code"]
+        old_code = stocks_data[index]["code"]
+        if by_code.get(old_code) == index:
+            del by_code[old_code]
+        by_code[stock_dict["code"]] = index
+        old_stock = stocks_data[index]
+        stocks_data[index] = stock_dict
+        _stocks_cache["by_id_bytes"].pop(old_stock["id"], None)
+        _stocks_cache["by_id_bytes"].pop(stock_dict["id"], None)
+        _journal(_stocks_cache, {"op": "upsert", "record": stock_dict})
+        if old_stock["market"].upper() != stock_dict["market"].upper():
+            _index_stocks_by_market(_stocks_cache)  # 시장 변경은 드물어 다시 만듭니다.
+            return True
+        market_stocks = _stocks_cache["by_market"][old_stock["market"].upper()]
+        for i, stock in enumerate(market_stocks):
+            if stock is old_stock:
+                market_stocks[i] = stock_dict
+                break
+        return True
+
+
+def _remove_ref(records, record):
+    """목록에서 record 객체(동일 참조)를 제거합니다."""
+    for i, item in enumerate(records):
+        if item is record:
+            del records[i]
+            return
+
+
+def _swap_pop(cache, data, index, key_indexes):
+    """index 위치의 항목을 마지막 항목과 바꿔 삭제하고(뒤쪽 항목 이동 없음) 위치 인덱스를 갱신합니다.
+
+    key_indexes 는 (위치 인덱스 이름, 키 필드) 목록입니다. 목록 순서는 바뀔 수 있습니다.
+    """
+    record = data[index]
+    for name, field in key_indexes:
+        positions = cache[name]
+        if positions.get(record[field]) == index:
+            del positions[record[field]]
+    last = data.pop()
+    if last is not record:
+        data[index] = last
+        for name, field in key_indexes:
+            positions = cache[name]
+            if positions.get(last[field]) == len(data):
+                positions[last[field]] = index
+    return record
+
+
+def pop_stock(stock_id):
+    """stock_id 의 주식 데이터를 삭제하고 인덱스와 저널을 갱신합니다. (없으면 None)"""
+    with _cache_lock:
+        index = _stocks_cache["by_id"].get(stock_id)
+        if index is None:
+            return None
+        stock = _swap_pop(_stocks_cache, _stocks_cache["data"], index, (("by_id", "id"), ("by_code", "code")))
+        _remove_ref(_stocks_cache["by_market"][stock["market"].upper()], stock)
+        _stocks_cache["by_id_bytes"].pop(stock["id"], None)
+        _journal(_stocks_cache, {"op": "delete", "id": stock["id"]})
+        return stock
 
 
 def get_next_stock_id():
-    """다음 주식 ID를 생성합니다."""
-    stocks_data = load_stocks()
-    if not stocks_data:
-        return 1
-    return max(stock["id"] for stock in stocks_data) + 1
+    """다음 주식 ID를 생성합니다. (목록을 훑지 않고 max_id 사용)"""
+    return _stocks_cache["max_id"] + 1
 
 
 def load_trading_configs():
     """JSON 파일에서 자동매매 설정 데이터를 로드합니다."""
-    if not os.path.exists(TRADING_CONFIGS_FILE):
-        return []
-    try:
-        with open(TRADING_CONFIGS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    return _load_cached(_configs_cache, _index_trading_configs, AutoTradingConfig)
+
+
+async def load_trading_configs_async():
+    """load_trading_configs 의 비동기 버전입니다. (핸들러용)"""
+    return await _load_cached_async(_configs_cache, _index_trading_configs, AutoTradingConfig)
 
 
 def save_trading_configs(configs_data):
     """자동매매 설정 데이터를 JSON 파일에 저장합니다."""
-    with open(TRADING_CONFIGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(configs_data, f, ensure_ascii=False, indent=2)
+    _save_cached(_configs_cache, configs_data, _index_trading_configs)
+
+
+def append_trading_config(config_dict):
+    """자동매매 설정을 추가하고 인덱스와 저널을 갱신합니다."""
+    with _cache_lock:
+        configs_data = _configs_cache["data"]
+        _configs_cache["by_id"][config_dict["id"]] = len(configs_data)
+        _configs_cache["by_user"][config_dict["user_id"]].append(config_dict)
+        _configs_cache["by_key"].setdefault(_config_key(config_dict), config_dict)
+        _configs_cache["max_id"] = max(_configs_cache["max_id"], config_dict["id"])
+        configs_data.append(config_dict)
+        _journal(_configs_cache, {"op": "upsert", "record": config_dict})
+
+
+def replace_trading_config(config_dict):
+    """같은 id 의 자동매매 설정을 교체하고 인덱스와 저널을 갱신합니다.
+
+    Returns:
+        교체했으면 True, 해당 id 가 없으면 False
+    """
+    with _cache_lock:
+        configs_data = _configs_cache["data"]
+        index = _configs_cache["by_id"].get(config_dict["id"])
+        if index is None:
+            return False
+        old_config = configs_data[index]
+        configs_data[index] = config_dict
+        _journal(_configs_cache, {"op": "upsert", "record": config_dict})
+        key = _config_key(config_dict)
+        if key != _config_key(old_config):
+            _index_trading_configs(_configs_cache)
+            return True
+        if _configs_cache["by_key"].get(key) is old_config:
+            _configs_cache["by_key"][key] = config_dict
+        user_configs = _configs_cache["by_user"][old_config["user_id"]]
+        for i, config in enumerate(user_configs):
+            if config is old_config:
+                user_configs[i] = config_dict
+                break
+        return True
+
+
+def pop_trading_config(config_id):
+    """config_id 의 자동매매 설정을 삭제하고 인덱스와 저널을 갱신합니다. (없으면 None)"""
+    with _cache_lock:
+        index = _configs_cache["by_id"].get(config_id)
+        if index is None:
+            return None
+        config = _swap_pop(_configs_cache, _configs_cache["data"], index, (("by_id", "id"),))
+        user_configs = _configs_cache["by_user"][config["user_id"]]
+        _remove_ref(user_configs, config)
+        key = _config_key(config)
+        by_key = _configs_cache["by_key"]
+        if by_key.get(key) is config:
+            del by_key[key]
+            for other in user_configs:  # 같은 키의 다른 설정이 남아 있으면 그 설정으로
+                if _config_key(other) == key:
+                    by_key[key] = other
+                    break
+        _journal(_configs_cache, {"op": "delete", "id": config["id"]})
+        return config
+
+
+def get_user_configs(user_id):
+    """사용자의 자동매매 설정 목록을 인덱스에서 조회합니다."""
+    return _configs_cache["by_user"].get(user_id, [])
 
 
 def get_next_config_id():
-    """다음 자동매매 설정 ID를 생성합니다."""
-    configs_data = load_trading_configs()
-    if not configs_data:
-        return 1
-    return max(config["id"] for config in configs_data) + 1
+    """다음 자동매매 설정 ID를 생성합니다. (목록을 훑지 않고 max_id 사용)"""
+    return _configs_cache["max_id"] + 1
 
 
 def initialize_sample_data():
     """샘플 주식 데이터를 초기화합니다."""
     stocks_data = load_stocks()
     if not stocks_data:  # 데이터가 없을 때만 샘플 데이터 추가
+        now = datetime.now().isoformat()
         sample_stocks = [
             {
                 "id": 1,
@@ -122,8 +717,8 @@ def initialize_sample_data():
                 "stop_loss_percent": 10.0,
                 "target_profit_percent": 20.0,
                 "memo": "반도체 대장주",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
             },
             {
                 "id": 2,
@@ -134,8 +729,8 @@ def initialize_sample_data():
                 "stop_loss_percent": 8.0,
                 "target_profit_percent": 15.0,
                 "memo": "메모리 반도체",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
             },
             {
                 "id": 3,
@@ -146,16 +741,15 @@ def initialize_sample_data():
                 "stop_loss_percent": 12.0,
                 "target_profit_percent": 25.0,
                 "memo": "IT 플랫폼",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
             },
         ]
         save_stocks(sample_stocks)
 
 
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    return """
+# 루트 페이지 HTML 은 요청마다 인코딩하지 않도록 import 시 한 번만 bytes 로 만들어 둡니다.
+_ROOT_HTML_BYTES = """
     <html>
         <head>
             <title>간단한 FastAPI</title>
@@ -187,6 +781,8 @@ async def read_root():
                     <p><strong>DELETE</strong> <code>/stocks/{stock_id}</code> - 주식 종목 삭제</p>
                     <p><strong>GET</strong> <code>/stocks/code/{code}</code> - 종목 코드로 조회</p>
                     <p><strong>GET</strong> <code>/stocks/market/{market}</code> - 시장별 조회</p>
+                    <p><strong>POST</strong> <code>/stocks/bulk</code> - 여러 종목 한 번에 추가</p>
+                    <p><strong>POST</strong> <code>/stocks/batch</code> - 여러 종목 일괄 추가/수정/삭제</p>
                 </div>
                 
                 <div class="endpoint">
@@ -199,193 +795,347 @@ async def read_root():
                     <p><strong>DELETE</strong> <code>/trading-configs/user/{user_id}/stock/{stock_code}</code> - 사용자별 종목별 설정 삭제</p>
                     <p><strong>POST</strong> <code>/trading-configs/{config_id}/toggle</code> - 활성화/비활성화</p>
                     <p><strong>POST</strong> <code>/trading-configs/user/{user_id}/stock/{stock_code}/toggle</code> - 사용자별 종목별 활성화/비활성화</p>
+                    <p><strong>POST</strong> <code>/trading-configs/batch</code> - 여러 설정 일괄 추가/수정/삭제</p>
+                </div>
+                
+                <div class="endpoint">
+                    <h3>📦 일괄 요청</h3>
+                    <p><strong>POST</strong> <code>/bulk</code> - 여러 API 요청을 한 번의 왕복으로 순서대로 처리</p>
                 </div>
                 
                 <p><a href="/docs">📖 Swagger UI 문서 보기</a></p>
             </div>
         </body>
     </html>
+    """.encode("utf-8")
+
+
+@app.get("/", response_class=HTMLResponse)
+async def read_root():
+    return HTMLResponse(
+        content=_ROOT_HTML_BYTES, headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+def _iter_json_list(records):
+    """레코드 목록을 STREAM_CHUNK_SIZE 건씩 JSON 배열 조각(bytes)으로 만들어 돌려줍니다."""
+    yield b"["
+    for start in range(0, len(records), STREAM_CHUNK_SIZE):
+        chunk = json_dumps(records[start:start + STREAM_CHUNK_SIZE])[1:-1]
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]"
+
+
+def _etag(cache):
+    """캐시 데이터 버전으로 약한 ETag 를 만듭니다. (서버 재시작 시 값이 겹치지 않도록 접두어 사용)"""
+    return f'W/"{_ETAG_PREFIX}-{cache["version"]:x}"'
+
+
+def _etag_matches(request, etag):
+    """If-None-Match 헤더에 etag 가 포함되어 있는지 확인합니다."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+def list_response(records, request=None, cache=None):
+    """저장된 목록을 검증/변환 없이 바로 응답합니다. 목록이 크면 StreamingResponse 로 보냅니다.
+
+    저장 데이터는 이미 모델 검증을 거쳤으므로 response_model 재검증과
+    jsonable_encoder 변환을 건너뜁니다. request 와 cache 를 넘기면 ETag 를 붙이고,
+    클라이언트의 If-None-Match 가 일치하면 직렬화 없이 304 를 반환합니다.
     """
+    headers = None
+    if request is not None and cache is not None:
+        etag = _etag(cache)
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        headers = {"ETag": etag}
+    if len(records) <= STREAM_THRESHOLD:
+        return DefaultJSONResponse(records, headers=headers)
+    # 스트리밍 도중 변경되어도 응답이 깨지지 않도록 현재 목록을 복사해 둡니다.
+    return StreamingResponse(
+        _iter_json_list(list(records)), media_type="application/json", headers=headers
+    )
 
 
-@app.get("/stocks", response_model=List[Stock])
-async def get_stocks():
+@app.get("/stocks", responses={200: {"model": List[Stock]}})
+async def get_stocks(request: Request):
     """모든 주식 종목을 조회합니다."""
-    stocks_data = load_stocks()
-    return stocks_data
+    stocks_data = await load_stocks_async()
+    return list_response(stocks_data, request, _stocks_cache)
 
 
-@app.post("/stocks", response_model=Stock)
-async def create_stock(stock: Stock):
+@app.post("/stocks", responses={200: {"model": Stock}}, openapi_extra=json_body_openapi(Stock))
+async def create_stock(stock: Stock = Depends(parse_stock), durable: bool = False):
     """새로운 주식 종목을 추가합니다."""
-    stocks_data = load_stocks()
+    await load_stocks_async()
 
     # 중복 종목 코드 확인
-    for existing_stock in stocks_data:
-        if existing_stock["code"] == stock.code:
-            raise HTTPException(
-                status_code=400, detail=f"종목 코드 '{stock.code}'가 이미 존재합니다"
-            )
+    if stock.code in _stocks_cache["by_code"]:
+        raise HTTPException(
+            status_code=400, detail=f"종목 코드 '{stock.code}'가 이미 존재합니다"
+        )
 
     # 새 주식 정보 생성
     stock.id = get_next_stock_id()
-    stock.created_at = datetime.now().isoformat()
-    stock.updated_at = datetime.now().isoformat()
+    now = datetime.now().isoformat()
+    stock.created_at = now
+    stock.updated_at = now
+
+    # 데이터 추가 (저널에 기록) - 저장한 dict 를 그대로 응답하여 모델 재검증을 생략합니다.
+    stock_dict = stock.model_dump()
+    append_stock(stock_dict)
+    if durable:
+        await sync_journal_async(_stocks_cache)
+
+    return stock_dict
 
-    # 데이터 추가 및 저장
-    stocks_data.append(stock.dict())
-    save_stocks(stocks_data)
 
-    return stock
+def stock_response(stock):
+    """주식 한 건을 응답합니다. 직렬화한 JSON 을 by_id_bytes 에 보관해 다음 조회 때 재사용합니다."""
+    by_id_bytes = _stocks_cache["by_id_bytes"]
+    body = by_id_bytes.get(stock["id"])
+    if body is None:
+        body = by_id_bytes[stock["id"]] = json_dumps(stock)
+    return Response(content=body, media_type="application/json")
 
 
-@app.get("/stocks/{stock_id}", response_model=Stock)
+@app.get("/stocks/{stock_id}", responses={200: {"model": Stock}})
 async def get_stock(stock_id: int):
     """특정 주식 종목을 조회합니다."""
-    stocks_data = load_stocks()
-
-    for stock in stocks_data:
-        if stock["id"] == stock_id:
-            return stock
+    stocks_data = await load_stocks_async()
 
-    raise HTTPException(
-        status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
-    )
+    index = _stocks_cache["by_id"].get(stock_id)
+    if index is None:
+        raise HTTPException(
+            status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
+        )
+    return stock_response(stocks_data[index])
 
 
-@app.get("/stocks/code/{code}", response_model=Stock)
+@app.get("/stocks/code/{code}", responses={200: {"model": Stock}})
 async def get_stock_by_code(code: str):
     """종목 코드로 주식 종목을 조회합니다."""
-    stocks_data = load_stocks()
-
-    for stock in stocks_data:
-        if stock["code"] == code:
-            return stock
+    stocks_data = await load_stocks_async()
 
-    raise HTTPException(
-        status_code=404, detail=f"종목 코드 '{code}'를 찾을 수 없습니다"
-    )
+    index = _stocks_cache["by_code"].get(code)
+    if index is None:
+        raise HTTPException(
+            status_code=404, detail=f"종목 코드 '{code}'를 찾을 수 없습니다"
+        )
+    return stock_response(stocks_data[index])
 
 
-@app.put("/stocks/{stock_id}", response_model=Stock)
-async def update_stock(stock_id: int, updated_stock: Stock):
+@app.put(
+    "/stocks/{stock_id}", responses={200: {"model": Stock}}, openapi_extra=json_body_openapi(Stock)
+)
+async def update_stock(
+    stock_id: int, updated_stock: Stock = Depends(parse_stock), durable: bool = False
+):
     """주식 종목 정보를 수정합니다."""
-    stocks_data = load_stocks()
-
-    for i, stock in enumerate(stocks_data):
-        if stock["id"] == stock_id:
-            updated_stock.id = stock_id
-            updated_stock.created_at = stock.get("created_at")
-            updated_stock.updated_at = datetime.now().isoformat()
-
-            for j, other_stock in enumerate(stocks_data):
-                if i != j and other_stock["code"] == updated_stock.code:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"종목 코드 '{updated_stock.code}'가 이미 존재합니다",
-                    )
-
-            stocks_data[i] = updated_stock.dict()
-            save_stocks(stocks_data)
-            return updated_stock
-
-    raise HTTPException(
-        status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
-    )
+    stocks_data = await load_stocks_async()
+
+    i = _stocks_cache["by_id"].get(stock_id)
+    if i is None:
+        raise HTTPException(
+            status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
+        )
+
+    stock = stocks_data[i]
+    updated_stock.id = stock_id
+    updated_stock.created_at = stock.get("created_at")
+    updated_stock.updated_at = datetime.now().isoformat()
+
+    j = _stocks_cache["by_code"].get(updated_stock.code)
+    if j is not None and j != i:
+        raise HTTPException(
+            status_code=400,
+            detail=f"종목 코드 '{updated_stock.code}'가 이미 존재합니다",
+        )
+
+    stock_dict = updated_stock.model_dump()
+    if not replace_stock(stock_dict):
+        raise HTTPException(
+            status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
+        )
+    if durable:
+        await sync_journal_async(_stocks_cache)
+    return stock_dict
 
 
 @app.delete("/stocks/{stock_id}")
-async def delete_stock(stock_id: int):
+async def delete_stock(stock_id: int, durable: bool = False):
     """주식 종목을 삭제합니다."""
-    stocks_data = load_stocks()
+    await load_stocks_async()
+
+    i = _stocks_cache["by_id"].get(stock_id)
+    if i is None:
+        raise HTTPException(
+            status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
+        )
+
+    deleted_stock = pop_stock(stock_id)
+    if deleted_stock is None:
+        raise HTTPException(
+            status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
+        )
+    if durable:
+        await sync_journal_async(_stocks_cache)
+    return {
+        "message": f"주식 종목 '{deleted_stock['name']} ({deleted_stock['code']})'이 삭제되었습니다"
+    }
 
-    for i, stock in enumerate(stocks_data):
-        if stock["id"] == stock_id:
-            deleted_stock = stocks_data.pop(i)
-            save_stocks(stocks_data)
-            return {
-                "message": f"주식 종목 '{deleted_stock['name']} ({deleted_stock['code']})'이 삭제되었습니다"
-            }
 
-    raise HTTPException(
-        status_code=404, detail=f"ID {stock_id}인 주식 종목을 찾을 수 없습니다"
+async def _run_batch(ops, create, update, delete, cache, durable):
+    """배치 작업을 순서대로 적용하고 작업별 결과 목록을 반환합니다.
+
+    각 작업은 단건 엔드포인트와 같은 검증을 거치며, 실패한 작업은
+    나머지 작업에 영향을 주지 않습니다. durable=True 이면 마지막에 한 번만 fsync 합니다.
+    """
+    results = []
+    for op in ops:
+        try:
+            if op.op != "delete" and op.payload is None:
+                raise HTTPException(status_code=400, detail=f"{op.op} 작업에는 payload가 필요합니다")
+            if op.op != "create" and op.id is None:
+                raise HTTPException(status_code=400, detail=f"{op.op} 작업에는 id가 필요합니다")
+
+            if op.op == "create":
+                result = await create(op.payload)
+            elif op.op == "update":
+                result = await update(op.id, op.payload)
+            else:
+                result = await delete(op.id)
+            results.append({"op": op.op, "status_code": 200, "result": result})
+        except HTTPException as e:
+            results.append({"op": op.op, "status_code": e.status_code, "detail": e.detail})
+
+    if durable:
+        await sync_journal_async(cache)
+    return results
+
+
+@app.post("/stocks/bulk", response_model=List[Stock])
+async def bulk_create_stocks(stocks: List[Stock], durable: bool = False):
+    """여러 주식 종목을 한 번에 추가합니다. 하나라도 중복이면 아무것도 추가하지 않습니다."""
+    await load_stocks_async()
+
+    # 모든 검사를 먼저 끝낸 뒤에 추가합니다.
+    by_code = _stocks_cache["by_code"]
+    seen_codes = set()
+    for stock in stocks:
+        if stock.code in by_code or stock.code in seen_codes:
+            raise HTTPException(
+                status_code=400, detail=f"종목 코드 '{stock.code}'가 이미 존재합니다"
+            )
+        seen_codes.add(stock.code)
+
+    next_id = get_next_stock_id()
+    now = datetime.now().isoformat()
+    with journal_batch():
+        for offset, stock in enumerate(stocks):
+            stock.id = next_id + offset
+            stock.created_at = now
+            stock.updated_at = now
+            append_stock(stock.model_dump())
+
+    if durable:
+        await sync_journal_async(_stocks_cache)
+    return stocks
+
+
+@app.post("/stocks/batch")
+async def batch_stocks(ops: List[StockBatchOp], durable: bool = False):
+    """여러 주식 종목 생성/수정/삭제 작업을 한 번의 요청으로 처리합니다."""
+    return await _run_batch(
+        ops, create_stock, update_stock, delete_stock, _stocks_cache, durable
     )
 
 
-@app.get("/stocks/market/{market}", response_model=List[Stock])
-async def get_stocks_by_market(market: str):
+@app.get("/stocks/market/{market}", responses={200: {"model": List[Stock]}})
+async def get_stocks_by_market(market: str, request: Request):
     """특정 시장의 주식 종목들을 조회합니다."""
-    stocks_data = load_stocks()
-    market_stocks = [
-        stock for stock in stocks_data if stock["market"].upper() == market.upper()
-    ]
-    return market_stocks
+    await load_stocks_async()
+    return list_response(_stocks_cache["by_market"].get(market.upper(), []), request, _stocks_cache)
 
 
-@app.get("/trading-configs", response_model=List[AutoTradingConfig])
-async def get_all_trading_configs():
+@app.get("/trading-configs", responses={200: {"model": List[AutoTradingConfig]}})
+async def get_all_trading_configs(request: Request):
     """모든 자동매매 설정을 조회합니다."""
-    configs_data = load_trading_configs()
-    return configs_data
+    configs_data = await load_trading_configs_async()
+    return list_response(configs_data, request, _configs_cache)
 
 
-@app.get("/trading-configs/stock/{stock_code}", response_model=AutoTradingConfig)
+@app.get(
+    "/trading-configs/stock/{stock_code}",
+    responses={200: {"model": AutoTradingConfig}, 204: {"description": "활성 설정 없음"}},
+)
 async def get_trading_config_by_stock(stock_code: str, user_id: str = None):
-    """특정 종목의 자동매매 설정을 조회합니다."""
-    configs_data = load_trading_configs()
-    
+    """특정 종목의 활성 자동매매 설정을 조회합니다. (없으면 204 No Content)"""
+    configs_data = await load_trading_configs_async()
+    if user_id is not None:
+        configs_data = get_user_configs(user_id)
+
     for config in configs_data:
         if config["stock_code"] == stock_code and config["is_active"]:
-            if user_id is None or config["user_id"] == user_id:
-                return config
-    
-    return None
+            return config
+
+    return Response(status_code=204)
 
 
 @app.get("/trading-configs/user/{user_id}/stock/{stock_code}")
 async def get_user_stock_config(user_id: str, stock_code: str):
     """특정 사용자의 특정 종목 설정을 조회합니다."""
-    configs_data = load_trading_configs()
-    
-    user_configs = []
-    for config in configs_data:
-        if config["user_id"] == user_id and config["stock_code"] == stock_code:
-            user_configs.append(config)
-    
-    if not user_configs:
-        return {"config": None, "message": "설정이 없습니다"}
-    
+    await load_trading_configs_async()
+
+    # 한 번 순회하면서 개수, 활성 설정, 최신 설정을 함께 구합니다.
     active_config = None
     latest_config = None
-    
-    for config in user_configs:
+    total_configs = 0
+
+    for config in get_user_configs(user_id):
+        if config["stock_code"] != stock_code:
+            continue
+        total_configs += 1
         if config["is_active"]:
             active_config = config
         if latest_config is None or config["updated_at"] > latest_config["updated_at"]:
             latest_config = config
-    
+
+    if not total_configs:
+        return {"config": None, "message": "설정이 없습니다"}
+
     result_config = active_config if active_config else latest_config
     
     return {
         "config": result_config,
         "message": "활성 설정" if active_config else "비활성 설정",
-        "total_configs": len(user_configs)
+        "total_configs": total_configs
     }
 
 
-@app.post("/trading-configs", response_model=AutoTradingConfig)
-async def create_or_update_trading_config(config: AutoTradingConfig):
+@app.post(
+    "/trading-configs",
+    response_model=AutoTradingConfig,
+    openapi_extra=json_body_openapi(AutoTradingConfig),
+)
+async def create_or_update_trading_config(
+    config: AutoTradingConfig = Depends(parse_trading_config), durable: bool = False
+):
     """자동매매 설정을 생성하거나 업데이트합니다."""
     try:
-        configs_data = load_trading_configs()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("받은 설정 데이터: %s", config.model_dump())
+        configs_data = await load_trading_configs_async()
 
         existing_config_index = None
-        for i, existing_config in enumerate(configs_data):
-            if (existing_config["user_id"] == config.user_id and 
-                existing_config["stock_code"] == config.stock_code and
-                existing_config.get("strategy_type", "mtt") == config.strategy_type):
-                existing_config_index = i
-                break
+        existing_config = _configs_cache["by_key"].get(
+            (config.user_id, config.stock_code, config.strategy_type)
+        )
+        if existing_config is not None:
+            existing_config_index = _configs_cache["by_id"][existing_config["id"]]
 
         # 설정을 딕셔너리로 변환 (명시적으로 필요한 필드만 추출)
         config_dict = {
@@ -404,137 +1154,166 @@ async def create_or_update_trading_config(config: AutoTradingConfig):
             "is_active": config.is_active,
         }
         
+        now = datetime.now().isoformat()
         if existing_config_index is not None:
             existing_config = configs_data[existing_config_index]
             config_dict["id"] = existing_config["id"]
             config_dict["created_at"] = existing_config["created_at"]
-            config_dict["updated_at"] = datetime.now().isoformat()
+            config_dict["updated_at"] = now
             
-            configs_data[existing_config_index] = config_dict
+            if not replace_trading_config(config_dict):
+                append_trading_config(config_dict)  # 그 사이 다시 읽은 파일에 없으면 추가
         else:
             config_dict["id"] = get_next_config_id()
-            config_dict["created_at"] = datetime.now().isoformat()
-            config_dict["updated_at"] = datetime.now().isoformat()
+            config_dict["created_at"] = now
+            config_dict["updated_at"] = now
             
-            configs_data.append(config_dict)
-
-        save_trading_configs(configs_data)
+            append_trading_config(config_dict)
 
+        if durable:
+            await sync_journal_async(_configs_cache)
         return config
         
     except Exception as e:
+        logger.exception(
+            "자동매매 설정 처리 오류 (user_id=%s, stock_code=%s)", config.user_id, config.stock_code
+        )
         raise HTTPException(status_code=400, detail=f"설정 처리 오류: {str(e)}")
 
 
-@app.get("/trading-configs/{user_id}", response_model=List[AutoTradingConfig])
-async def get_user_trading_configs(user_id: str, strategy_type: Optional[str] = None):
+@app.get("/trading-configs/{user_id}", responses={200: {"model": List[AutoTradingConfig]}})
+async def get_user_trading_configs(
+    user_id: str, request: Request, strategy_type: Optional[str] = None
+):
     """사용자별 자동매매 설정을 조회합니다. (strategy_type 필터 지원)"""
-    configs_data = load_trading_configs()
-    user_configs = [
-        config for config in configs_data 
-        if config["user_id"] == user_id
-    ]
-    
+    await load_trading_configs_async()
+    user_configs = get_user_configs(user_id)
+
     # strategy_type 필터링
     if strategy_type:
         user_configs = [
             config for config in user_configs
             if config.get("strategy_type", "mtt") == strategy_type
         ]
-    
-    return user_configs
+
+    return list_response(user_configs, request, _configs_cache)
 
 
-@app.put("/trading-configs/{config_id}", response_model=AutoTradingConfig)
-async def update_trading_config(config_id: int, updated_config: AutoTradingConfig):
+@app.put(
+    "/trading-configs/{config_id}",
+    responses={200: {"model": AutoTradingConfig}},
+    openapi_extra=json_body_openapi(AutoTradingConfig),
+)
+async def update_trading_config(
+    config_id: int,
+    updated_config: AutoTradingConfig = Depends(parse_trading_config),
+    durable: bool = False,
+):
     """자동매매 설정을 수정합니다."""
-    configs_data = load_trading_configs()
-
-    for i, config in enumerate(configs_data):
-        if config["id"] == config_id:
-            updated_config.id = config_id
-            updated_config.created_at = config.get("created_at")
-            updated_config.updated_at = datetime.now().isoformat()
-
-            for j, other_config in enumerate(configs_data):
-                if (i != j and 
-                    other_config["user_id"] == updated_config.user_id and
-                    other_config["stock_code"] == updated_config.stock_code and
-                    other_config["is_active"] and updated_config.is_active):
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"사용자 '{updated_config.user_id}'의 종목 '{updated_config.stock_code}' 활성 설정이 이미 존재합니다"
-                    )
-
-            # 설정을 딕셔너리로 변환 (명시적으로 필요한 필드만 추출)
-            config_dict = {
-                "id": config_id,
-                "stock_code": updated_config.stock_code,
-                "stock_name": updated_config.stock_name,
-                "trading_mode": updated_config.trading_mode,
-                "strategy_type": updated_config.strategy_type,
-                "max_loss": updated_config.max_loss,
-                "stop_loss": updated_config.stop_loss,
-                "take_profit": updated_config.take_profit,
-                "pyramiding_count": updated_config.pyramiding_count,
-                "entry_point": updated_config.entry_point,
-                "pyramiding_entries": updated_config.pyramiding_entries,
-                "positions": updated_config.positions,
-                "user_id": updated_config.user_id,
-                "created_at": config.get("created_at"),
-                "updated_at": datetime.now().isoformat(),
-                "is_active": updated_config.is_active,
-            }
-            
-            configs_data[i] = config_dict
-            save_trading_configs(configs_data)
-            return updated_config
+    configs_data = await load_trading_configs_async()
+
+    i = _configs_cache["by_id"].get(config_id)
+    if i is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"ID {config_id}인 자동매매 설정을 찾을 수 없습니다"
+        )
+
+    config = configs_data[i]
+    now = datetime.now().isoformat()
+
+    for other_config in get_user_configs(updated_config.user_id):
+        if (other_config is not config and
+            other_config["stock_code"] == updated_config.stock_code and
+            other_config["is_active"] and updated_config.is_active):
+            raise HTTPException(
+                status_code=400,
+                detail=f"사용자 '{updated_config.user_id}'의 종목 '{updated_config.stock_code}' 활성 설정이 이미 존재합니다"
+            )
 
-    raise HTTPException(
-        status_code=404, 
-        detail=f"ID {config_id}인 자동매매 설정을 찾을 수 없습니다"
-    )
+    # 설정을 딕셔너리로 변환 (명시적으로 필요한 필드만 추출)
+    config_dict = {
+        "id": config_id,
+        "stock_code": updated_config.stock_code,
+        "stock_name": updated_config.stock_name,
+        "trading_mode": updated_config.trading_mode,
+        "strategy_type": updated_config.strategy_type,
+        "max_loss": updated_config.max_loss,
+        "stop_loss": updated_config.stop_loss,
+        "take_profit": updated_config.take_profit,
+        "pyramiding_count": updated_config.pyramiding_count,
+        "entry_point": updated_config.entry_point,
+        "pyramiding_entries": updated_config.pyramiding_entries,
+        "positions": updated_config.positions,
+        "user_id": updated_config.user_id,
+        "created_at": config.get("created_at"),
+        "updated_at": now,
+        "is_active": updated_config.is_active,
+    }
+
+    if not replace_trading_config(config_dict):
+        raise HTTPException(
+            status_code=404,
+            detail=f"ID {config_id}인 자동매매 설정을 찾을 수 없습니다"
+        )
+    if durable:
+        await sync_journal_async(_configs_cache)
+    return config_dict
 
 
 @app.delete("/trading-configs/{config_id}")
-async def delete_trading_config(config_id: int):
+async def delete_trading_config(config_id: int, durable: bool = False):
     """자동매매 설정을 삭제합니다."""
-    configs_data = load_trading_configs()
-
-    for i, config in enumerate(configs_data):
-        if config["id"] == config_id:
-            deleted_config = configs_data.pop(i)
-            save_trading_configs(configs_data)
-            return {
-                "message": f"자동매매 설정 '{deleted_config['stock_name']} ({deleted_config['stock_code']})'이 삭제되었습니다"
-            }
-
-    raise HTTPException(
-        status_code=404, 
-        detail=f"ID {config_id}인 자동매매 설정을 찾을 수 없습니다"
-    )
+    await load_trading_configs_async()
+
+    i = _configs_cache["by_id"].get(config_id)
+    if i is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"ID {config_id}인 자동매매 설정을 찾을 수 없습니다"
+        )
+
+    deleted_config = pop_trading_config(config_id)
+    if deleted_config is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"ID {config_id}인 자동매매 설정을 찾을 수 없습니다"
+        )
+    if durable:
+        await sync_journal_async(_configs_cache)
+    return {
+        "message": f"자동매매 설정 '{deleted_config['stock_name']} ({deleted_config['stock_code']})'이 삭제되었습니다"
+    }
 
 
 @app.delete("/trading-configs/user/{user_id}/stock/{stock_code}")
-async def delete_trading_config_by_user_stock(user_id: str, stock_code: str, strategy_type: Optional[str] = None):
+async def delete_trading_config_by_user_stock(
+    user_id: str, stock_code: str, strategy_type: Optional[str] = None, durable: bool = False
+):
     """특정 사용자의 특정 종목 자동매매 설정을 삭제합니다. (strategy_type 필터 지원)"""
-    configs_data = load_trading_configs()
-    
-    deleted_configs = []
-    filtered_configs = []
-    
-    for config in configs_data:
-        if (config["user_id"] == user_id and config["stock_code"] == stock_code):
-            # strategy_type이 지정된 경우 해당 전략만 삭제
-            if strategy_type and config.get("strategy_type", "mtt") != strategy_type:
-                filtered_configs.append(config)
-            else:
-                deleted_configs.append(config)
-        else:
-            filtered_configs.append(config)
-    
+    await load_trading_configs_async()
+
+    # strategy_type이 지정된 경우 해당 전략만 삭제
+    config_ids = [
+        config["id"]
+        for config in sorted(
+            get_user_configs(user_id), key=lambda config: _configs_cache["by_id"][config["id"]]
+        )
+        if config["stock_code"] == stock_code
+        and (not strategy_type or config.get("strategy_type", "mtt") == strategy_type)
+    ]
+
+    # 뒤에서부터 삭제해야 앞쪽 위치가 바뀌지 않습니다. (삭제 내역은 저널에 기록)
+    deleted_configs = [
+        config
+        for config in map(pop_trading_config, reversed(config_ids))
+        if config is not None
+    ]
+    deleted_configs.reverse()
+
     if deleted_configs:
-        save_trading_configs(filtered_configs)
+        if durable:
+            await sync_journal_async(_configs_cache)
         
         stock_name = deleted_configs[0]['stock_name']
         return {
@@ -548,13 +1327,50 @@ async def delete_trading_config_by_user_stock(user_id: str, stock_code: str, str
     )
 
 
+@app.post("/trading-configs/batch")
+async def batch_trading_configs(ops: List[TradingConfigBatchOp], durable: bool = False):
+    """여러 자동매매 설정 생성/수정/삭제 작업을 한 번의 요청으로 처리합니다."""
+    return await _run_batch(
+        ops,
+        create_or_update_trading_config,
+        update_trading_config,
+        delete_trading_config,
+        _configs_cache,
+        durable,
+    )
+
+
+@app.post("/bulk")
+async def bulk_requests(calls: List[BulkRequest]):
+    """여러 API 요청을 순서대로 앱 내부에서 실행하고 요청별 응답 목록을 반환합니다.
+
+    원격 클라이언트가 요청마다 왕복하지 않도록 하나로 묶어 보냅니다. 각 요청은
+    단건 엔드포인트와 같은 검증을 거치며, 실패한 요청은 나머지 요청에 영향을 주지 않습니다.
+    """
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bulk") as client:
+        for call in calls:
+            if call.path.split("?", 1)[0].rstrip("/") == "/bulk":
+                results.append({"status": 400, "body": {"detail": "/bulk 요청은 중첩할 수 없습니다"}})
+                continue
+            response = await client.request(call.method, call.path, json=call.body)
+            if not response.content:
+                body = None
+            elif response.headers.get("content-type", "").startswith("application/json"):
+                body = response.json()
+            else:
+                body = response.text
+            results.append({"status": response.status_code, "body": body})
+    return results
+
+
 def load_trade_history():
     """거래 이력 JSON 파일을 로드합니다."""
     if not os.path.exists(TRADE_HISTORY_FILE):
         return {}
     try:
-        with open(TRADE_HISTORY_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json_file(TRADE_HISTORY_FILE)
     except (json.JSONDecodeError, FileNotFoundError):
         return {}
 
@@ -603,10 +1419,10 @@ async def get_trading_status():
     """현재 거래 상태 및 피라미딩 정보를 조회합니다."""
     try:
         # 거래 이력 로드
-        trade_history = load_trade_history()
+        trade_history = await asyncio.to_thread(load_trade_history)
         
         # 자동매매 설정 로드
-        configs_data = load_trading_configs()
+        configs_data = await load_trading_configs_async()
         
         result = {}
         for config in configs_data:
@@ -629,10 +1445,10 @@ async def get_stock_trading_status(stock_code: str):
     """특정 종목의 거래 상태를 조회합니다."""
     try:
         # 거래 이력 로드
-        trade_history = load_trade_history()
+        trade_history = await asyncio.to_thread(load_trade_history)
         
         # 해당 종목의 설정 찾기
-        configs_data = load_trading_configs()
+        configs_data = await load_trading_configs_async()
         config = None
         for c in configs_data:
             if c["stock_code"] == stock_code:
@@ -663,4 +1479,6 @@ async def health_check():
 
 if __name__ == "__main__":
     initialize_sample_data()
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # loop/http 는 기본값 "auto" 로, uvloop/httptools 가 설치되어 있으면 자동으로 사용합니다.
+    # (uvloop 은 Windows 미지원) 캐시와 저널이 프로세스 메모리에 있으므로 워커는 1개로 유지합니다.
+    uvicorn.run(app, host="0.0.0.0", port=8080, loop="auto", http="auto")
@@ -14,158 +14,248 @@ try:
     import KIS_Common as Common
     import KIS_API_Helper_KR as KisKR
     import json
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from contextlib import contextmanager, redirect_stdout
+    from functools import lru_cache
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError as e:
     print(f"모듈 임포트 오류: {e}")
     sys.exit(1)
 
+# API 호출 간 TCP/TLS 연결을 재사용하도록 세션 하나를 공유합니다.
+# 일시적인 5xx/429/연결 오류는 지수 백오프로 재시도해서 스크립트 재실행(토큰 재발급)을 피합니다.
+# 주문 같은 POST/PUT 은 중복 실행될 수 있으므로 자동 재시도는 조회(GET)에만 적용합니다.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=RETRY))
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=RETRY))
+
+# 토큰은 KIS_Common 이 GetTokenPath 파일에 만료 시각과 함께 저장해 두고 재사용합니다.
+# (KIS 토큰 발급은 1분에 1회 정도로 제한되고, 토큰은 24시간 유효)
+FORCE_REFRESH = "--force-refresh" in sys.argv[1:]  # 진단용: 저장된 토큰을 무시하고 새로 발급
+VERBOSE = "--verbose" in sys.argv[1:]  # 성공 응답 본문도 출력
+HUMAN = "--human" in sys.argv[1:]  # 기존 사람용 출력 (기본은 단계별 JSON 한 줄)
+REPORT_OUT = sys.stdout  # JSON 결과 줄을 쓸 곳 (헬퍼 출력은 main 에서 stderr 로 돌립니다)
+REPORT_LOCK = threading.Lock()
+
+
+# 잔고 조회 API 경로 (URL 은 모드별로 balance_url 에서 한 번만 만듭니다)
+BALANCE_PATH = "/uapi/domestic-stock/v1/trading/inquire-balance"
+
+# 잔고 조회 요청의 고정 헤더/파라미터 (호출 시 토큰·계좌 정보만 채웁니다)
+BALANCE_HEADERS = {
+    "Content-Type": "application/json",
+    "tr_id": "VTTC8434R",  # 모의투자 잔고 조회
+    "custtype": "P"
+}
+BALANCE_PARAMS = {
+    "AFHR_FLPR_YN": "N",
+    "OFL_YN": "",
+    "INQR_DVSN": "02",
+    "UNPR_DVSN": "01",
+    "FUND_STTL_ICLD_YN": "N",
+    "FNCG_AMT_AUTO_RDPT_YN": "N",
+    "PRCS_DVSN": "01",
+    "CTX_AREA_FK100": "",
+    "CTX_AREA_NK100": ""
+}
+
+
+def say(message):
+    """사람용 출력 모드에서만 안내 문구를 출력합니다."""
+    if HUMAN:
+        print(message)
+
+
+def report(step, ok, message, **detail):
+    """단계 결과를 출력합니다. 기본은 JSON 한 줄, --human 이면 기존 문구입니다.
+
+    줄바꿈까지 락 안에서 한 번에 쓰므로 동시에 실행되는 단계의 결과도 줄 단위로 구분됩니다.
+    """
+    if HUMAN:
+        if message:
+            print(message)
+    else:
+        line = json.dumps({"step": step, "ok": ok, **detail}, ensure_ascii=False, default=str)
+        with REPORT_LOCK:
+            REPORT_OUT.write(line + "\n")
+            REPORT_OUT.flush()
+
+
+@contextmanager
+def kis_mode(mode):
+    """블록 안에서만 계좌 모드를 mode 로 바꾸고, 끝나면 이전 모드로 되돌립니다."""
+    prev = Common.GetNowDist()
+    Common.SetChangeMode(mode)
+    try:
+        yield
+    finally:
+        Common.SetChangeMode(prev)
+
+
+@lru_cache(maxsize=None)
+def account_info(mode):
+    """(app_key, app_secret, account_no, prdt_cd, url) 를 한 번만 조회해 재사용합니다."""
+    return (
+        Common.GetAppKey(mode),
+        Common.GetAppSecret(mode),
+        Common.GetAccountNo(mode),
+        Common.GetPrdtNo(mode),
+        Common.GetUrlBase(mode),
+    )
+
+
+@lru_cache(maxsize=None)
+def balance_url(mode):
+    """모드별 잔고 조회 API 전체 URL 을 반환합니다."""
+    return account_info(mode)[4] + BALANCE_PATH
+
+
 def test_token_generation():
-    """토큰 생성 테스트"""
-    print("=== 토큰 생성 테스트 ===")
+    """토큰 생성 테스트 (성공하면 토큰, 실패하면 None 반환)"""
+    say("=== 토큰 생성 테스트 ===")
     try:
-        # 모의계좌 모드로 설정
-        Common.SetChangeMode("VIRTUAL")
-        
-        # 토큰 생성 시도
-        token = Common.MakeToken("VIRTUAL")
+        # 토큰 생성 시도 (저장된 토큰이 유효하면 재사용, --force-refresh 로 강제 발급)
+        token = Common.GetToken("VIRTUAL", force_refresh=FORCE_REFRESH)
         if token != "FAIL":
-            print(f"✅ 토큰 생성 성공: {token[:20]}...")
-            return True
+            report("token", True, f"✅ 토큰 생성 성공: {token[:20]}...")
+            return token
         else:
-            print("❌ 토큰 생성 실패")
-            return False
+            report("token", False, "❌ 토큰 생성 실패")
+            return None
     except Exception as e:
-        print(f"❌ 토큰 생성 오류: {e}")
-        return False
+        report("token", False, f"❌ 토큰 생성 오류: {e}", error=str(e))
+        return None
 
 def test_account_info():
     """계좌 정보 테스트"""
-    print("\n=== 계좌 정보 확인 ===")
+    say("\n=== 계좌 정보 확인 ===")
     try:
-        app_key = Common.GetAppKey("VIRTUAL")
-        app_secret = Common.GetAppSecret("VIRTUAL")
-        account_no = Common.GetAccountNo("VIRTUAL")
-        prdt_cd = Common.GetPrdtNo("VIRTUAL")
-        url = Common.GetUrlBase("VIRTUAL")
+        app_key, app_secret, account_no, prdt_cd, url = account_info("VIRTUAL")
         
-        print(f"APP_KEY: {app_key[:10]}...")
-        print(f"APP_SECRET: {app_secret[:10]}...")
-        print(f"계좌번호: {account_no}")
-        print(f"상품코드: {prdt_cd}")
-        print(f"URL: {url}")
+        say(f"APP_KEY: {app_key[:10]}...")
+        say(f"APP_SECRET: {app_secret[:10]}...")
+        say(f"계좌번호: {account_no}")
+        say(f"상품코드: {prdt_cd}")
+        say(f"URL: {url}")
+        report("account_info", True, "", account_no=account_no, prdt_cd=prdt_cd, url=url)
         
         return True
     except Exception as e:
-        print(f"❌ 계좌 정보 조회 오류: {e}")
+        report("account_info", False, f"❌ 계좌 정보 조회 오류: {e}", error=str(e))
         return False
 
-def test_balance_api():
-    """잔고 조회 API 직접 테스트"""
-    print("\n=== 잔고 조회 API 테스트 ===")
+def test_balance_api(token=None):
+    """잔고 조회 API 직접 테스트 (token: 2단계에서 받은 토큰, 없으면 저장된 토큰 사용)"""
+    say("\n=== 잔고 조회 API 테스트 ===")
     try:
-        # 모의계좌 설정
-        Common.SetChangeMode("VIRTUAL")
-        
-        # 토큰 가져오기
-        token = Common.GetToken("VIRTUAL")
+        if token is None:
+            token = Common.GetToken("VIRTUAL")
         
         # API 호출 정보
-        app_key = Common.GetAppKey("VIRTUAL")
-        app_secret = Common.GetAppSecret("VIRTUAL")
-        account_no = Common.GetAccountNo("VIRTUAL")
-        prdt_cd = Common.GetPrdtNo("VIRTUAL")
-        url = Common.GetUrlBase("VIRTUAL")
+        app_key, app_secret, account_no, prdt_cd, _ = account_info("VIRTUAL")
         
-        # 헤더 설정
+        # 헤더/파라미터 설정 (고정 값은 모듈 상수에서 가져옵니다)
         headers = {
-            "Content-Type": "application/json",
+            **BALANCE_HEADERS,
             "authorization": f"Bearer {token}",
             "appkey": app_key,
             "appsecret": app_secret,
-            "tr_id": "VTTC8434R",  # 모의투자 잔고 조회
-            "custtype": "P"
-        }
-        
-        # 파라미터 설정
-        params = {
-            "CANO": account_no,
-            "ACNT_PRDT_CD": prdt_cd,
-            "AFHR_FLPR_YN": "N",
-            "OFL_YN": "",
-            "INQR_DVSN": "02",
-            "UNPR_DVSN": "01",
-            "FUND_STTL_ICLD_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "PRCS_DVSN": "01",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": ""
         }
+        params = {**BALANCE_PARAMS, "CANO": account_no, "ACNT_PRDT_CD": prdt_cd}
         
         # API 호출
-        api_url = f"{url}/uapi/domestic-stock/v1/trading/inquire-balance"
-        print(f"API URL: {api_url}")
-        print(f"계좌번호: {account_no}")
-        print(f"상품코드: {prdt_cd}")
+        api_url = balance_url("VIRTUAL")
+        say(f"API URL: {api_url}")
+        say(f"계좌번호: {account_no}")
+        say(f"상품코드: {prdt_cd}")
         
-        response = requests.get(api_url, headers=headers, params=params)
+        response = SESSION.get(api_url, headers=headers, params=params)
         
-        print(f"응답 코드: {response.status_code}")
-        print(f"응답 내용: {response.text}")
+        say(f"응답 코드: {response.status_code}")
         
         if response.status_code == 200:
             result = response.json()
             if result.get("rt_cd") == "0":
-                print("✅ 잔고 조회 성공!")
+                if VERBOSE:
+                    say(f"응답 내용: {response.text[:500]}")
+                report("balance_api", True, "✅ 잔고 조회 성공!", status=200)
                 return True
             else:
-                print(f"❌ API 오류: {result}")
+                report("balance_api", False, f"❌ API 오류: {result}", status=200, result=result)
                 return False
         else:
-            print(f"❌ HTTP 오류: {response.status_code}")
+            say(f"응답 내용: {response.text}")
+            report(
+                "balance_api", False, f"❌ HTTP 오류: {response.status_code}",
+                status=response.status_code, body=response.text,
+            )
             return False
             
     except Exception as e:
-        print(f"❌ 잔고 조회 오류: {e}")
+        report("balance_api", False, f"❌ 잔고 조회 오류: {e}", error=str(e))
         return False
 
 def test_kis_kr_balance():
     """KIS_API_Helper_KR을 통한 잔고 조회 테스트"""
-    print("\n=== KIS_API_Helper_KR 잔고 조회 테스트 ===")
+    say("\n=== KIS_API_Helper_KR 잔고 조회 테스트 ===")
     try:
-        Common.SetChangeMode("VIRTUAL")
         balance = KisKR.GetBalance()
-        print(f"✅ 잔고 조회 성공: {balance}")
+        report("kis_kr_balance", True, f"✅ 잔고 조회 성공: {balance}", balance=balance)
         return True
     except Exception as e:
-        print(f"❌ KIS_API_Helper_KR 잔고 조회 오류: {e}")
+        report("kis_kr_balance", False, f"❌ KIS_API_Helper_KR 잔고 조회 오류: {e}", error=str(e))
         return False
 
-def main():
-    """메인 함수"""
-    print("한국투자증권 API 계좌 진단 시작\n")
+def run_diagnostics():
+    """계좌 진단 단계를 순서대로 실행합니다."""
+    say("한국투자증권 API 계좌 진단 시작\n")
     
     # 1. 계좌 정보 확인
     if not test_account_info():
-        print("계좌 정보 확인 실패. myStockInfo.yaml 파일을 확인하세요.")
+        say("계좌 정보 확인 실패. myStockInfo.yaml 파일을 확인하세요.")
         return
     
-    # 2. 토큰 생성 테스트
-    if not test_token_generation():
-        print("토큰 생성 실패. APP_KEY와 APP_SECRET을 확인하세요.")
-        return
-    
-    # 3. 직접 API 호출 테스트
-    test_balance_api()
-    
-    # 4. KIS_API_Helper_KR 테스트
-    test_kis_kr_balance()
+    # 2~4 단계는 모의계좌 모드에서 실행합니다.
+    with kis_mode("VIRTUAL"):
+        # 2. 토큰 생성 테스트
+        token = test_token_generation()
+        if token is None:
+            say("토큰 생성 실패. APP_KEY와 APP_SECRET을 확인하세요.")
+            return
+        
+        # 3. 직접 API 호출 테스트 / 4. KIS_API_Helper_KR 테스트
+        # 서로 독립적인 네트워크 호출이므로 동시에 실행합니다. (출력 순서는 섞일 수 있음)
+        # 토큰은 2단계에서 이미 발급/저장되었으므로 두 스레드가 동시에 토큰을 발급하거나 쓰지 않습니다.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            balance_future = executor.submit(test_balance_api, token)
+            kis_kr_future = executor.submit(test_kis_kr_balance)
+            balance_future.result()
+            kis_kr_future.result()
     
-    print("\n=== 진단 완료 ===")
-    print("\n📋 문제 해결 가이드:")
-    print("1. 계좌번호가 8자리인지 확인")
-    print("2. 모의투자 계좌가 활성화되어 있는지 확인")
-    print("3. APP_KEY/SECRET이 모의투자용인지 확인")
-    print("4. 한국투자증권 홈페이지에서 API 사용 설정 확인")
+    say("\n=== 진단 완료 ===")
+    say("\n📋 문제 해결 가이드:")
+    say("1. 계좌번호가 8자리인지 확인")
+    say("2. 모의투자 계좌가 활성화되어 있는지 확인")
+    say("3. APP_KEY/SECRET이 모의투자용인지 확인")
+    say("4. 한국투자증권 홈페이지에서 API 사용 설정 확인")
+
+def main():
+    """메인 함수"""
+    if HUMAN:
+        run_diagnostics()
+        return
+    # JSON 모드의 stdout 에는 결과 줄만 남도록 KIS 헬퍼의 print(토큰 발급 안내 등)는 stderr 로 보냅니다.
+    with redirect_stdout(sys.stderr):
+        run_diagnostics()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,151 +1,255 @@
-import requests
+import asyncio
+import httpx
 import json
+import os
+import sys
+import time
 
-BASE_URL = "http://localhost:8080"
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 사용
+    orjson = None
 
-def test_health():
-    """헬스 체크 테스트"""
-    response = requests.get(f"{BASE_URL}/health")
-    print("✅ 헬스 체크:", response.json())
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
 
-def test_get_all_stocks():
-    """전체 주식 목록 조회"""
-    response = requests.get(f"{BASE_URL}/stocks")
-    print("✅ 전체 주식 목록:")
-    for stock in response.json():
-        print(f"  - {stock['name']} ({stock['code']}): 목표가 {stock.get('target_price', 'N/A')}")
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
-def test_create_stock():
-    """새로운 주식 종목 추가"""
-    new_stock = {
-        "code": "096770",
-        "name": "SK이노베이션",
-        "market": "KOSPI",
-        "target_price": 120000,
-        "stop_loss_percent": 15.0,
-        "target_profit_percent": 30.0,
-        "memo": "석유화학 및 배터리"
-    }
-    
-    response = requests.post(f"{BASE_URL}/stocks", json=new_stock)
+# 대상 서버 주소 (예: STOCK_API_URL=http://localhost:8000 python test_api.py)
+BASE_URL = os.environ.get("STOCK_API_URL", "http://localhost:8080")
+JSON_HEADERS = {"Content-Type": "application/json"}
+LOAD_TEST = "--load" in sys.argv[1:]  # 자동매매 설정 동시 생성 부하 테스트 실행
+TEST_USER_ID = "test_user_001"
+
+NEW_STOCK = {
+    "code": "096770",
+    "name": "SK이노베이션",
+    "market": "KOSPI",
+    "target_price": 120000,
+    "stop_loss_percent": 15.0,
+    "target_profit_percent": 30.0,
+    "memo": "석유화학 및 배터리"
+}
+
+UPDATED_STOCK = {
+    "code": "005930",
+    "name": "삼성전자",
+    "market": "KOSPI",
+    "target_price": 85000,
+    "stop_loss_percent": 8.0,
+    "target_profit_percent": 25.0,
+    "memo": "반도체 대장주 - 목표가 상향 조정"
+}
+
+NEW_CONFIG = {
+    "stock_code": "005930",
+    "stock_name": "삼성전자",
+    "trading_mode": "turtle",
+    "strategy_type": "mtt",
+    "max_loss": 10.0,
+    "stop_loss": 5.0,
+    "take_profit": 15.0,
+    "pyramiding_count": 3,
+    "entry_point": 75000.0,
+    "pyramiding_entries": ["1", "2", "3"],
+    "positions": [25.0, 25.0, 25.0, 25.0],
+    "user_id": TEST_USER_ID,
+    "is_active": True
+}
+
+# 응답 출력 함수 (개별 호출과 /bulk 결과 모두에 사용)
+def skipped_missing_api(response):
+    """자동매매 설정 API 가 없는 서버(404)이면 건너뜀을 출력하고 True 를 반환합니다."""
+    if response.status_code == 404:
+        print("⏭️ 자동매매 설정 API가 없는 서버입니다 - 건너뜀")
+        return True
+    return False
+
+def show_health(response):
+    print("✅ 헬스 체크:", _loads(response.content))
+
+def show_all_stocks(response):
+    # 행마다 print 하지 않고 한 번에 출력합니다.
+    lines = ["✅ 전체 주식 목록:"]
+    lines.extend(
+        f"  - {stock['name']} ({stock['code']}): 목표가 {stock.get('target_price', 'N/A')}"
+        for stock in _loads(response.content)
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def show_create_stock(response):
     if response.status_code == 200:
-        print("✅ 새 주식 추가 성공:", response.json()['name'])
+        print("✅ 새 주식 추가 성공:", _loads(response.content)['name'])
     else:
-        print("❌ 주식 추가 실패:", response.json())
+        print("❌ 주식 추가 실패:", _loads(response.content))
 
-def test_get_stock_by_code():
-    """종목 코드로 조회"""
-    response = requests.get(f"{BASE_URL}/stocks/code/005930")
+def show_stock_by_code(response):
     if response.status_code == 200:
-        stock = response.json()
+        stock = _loads(response.content)
         print(f"✅ 종목 조회 성공: {stock['name']} - 목표가: {stock.get('target_price', 'N/A')}")
     else:
-        print("❌ 종목 조회 실패:", response.json())
+        print("❌ 종목 조회 실패:", _loads(response.content))
 
-def test_update_stock():
-    """주식 정보 수정"""
-    updated_data = {
-        "code": "005930",
-        "name": "삼성전자",
-        "market": "KOSPI",
-        "target_price": 85000,
-        "stop_loss_percent": 8.0,
-        "target_profit_percent": 25.0,
-        "memo": "반도체 대장주 - 목표가 상향 조정"
-    }
-    
-    response = requests.put(f"{BASE_URL}/stocks/1", json=updated_data)
+def show_update_stock(response):
     if response.status_code == 200:
         print("✅ 주식 정보 수정 성공")
     else:
-        print("❌ 주식 정보 수정 실패:", response.json())
+        print("❌ 주식 정보 수정 실패:", _loads(response.content))
 
-def test_create_trading_config():
-    """새로운 자동매매 설정 추가"""
-    new_config = {
-        "stock_code": "005930",
-        "stock_name": "삼성전자",
-        "trading_mode": "turtle",
-        "strategy_type": "mtt",
-        "max_loss": 10.0,
-        "stop_loss": 5.0,
-        "take_profit": 15.0,
-        "pyramiding_count": 3,
-        "entry_point": 75000.0,
-        "pyramiding_entries": ["1", "2", "3"],
-        "positions": [25.0, 25.0, 25.0, 25.0],
-        "user_id": "test_user_001",
-        "is_active": True
-    }
-    
-    response = requests.post(f"{BASE_URL}/trading-configs", json=new_config)
+def show_create_trading_config(response):
+    if skipped_missing_api(response):
+        return
     if response.status_code == 200:
-        config = response.json()
+        config = _loads(response.content)
         print(f"✅ 자동매매 설정 추가 성공: {config['stock_name']} ({config['trading_mode']})")
     else:
-        print("❌ 자동매매 설정 추가 실패:", response.json())
+        print("❌ 자동매매 설정 추가 실패:", _loads(response.content))
 
-def test_get_all_trading_configs():
-    """모든 자동매매 설정 조회"""
-    response = requests.get(f"{BASE_URL}/trading-configs")
+def show_all_trading_configs(response):
+    if skipped_missing_api(response):
+        return
     if response.status_code == 200:
-        configs = response.json()
-        print(f"✅ 전체 자동매매 설정 조회 성공: {len(configs)}개 설정")
-        for config in configs:
-            status = "활성" if config["is_active"] else "비활성"
-            print(f"  - {config['stock_name']} ({config['stock_code']}): {config['trading_mode']} - {status}")
+        configs = _loads(response.content)
+        lines = [f"✅ 전체 자동매매 설정 조회 성공: {len(configs)}개 설정"]
+        lines.extend(
+            f"  - {config['stock_name']} ({config['stock_code']}): {config['trading_mode']} - "
+            + ("활성" if config["is_active"] else "비활성")
+            for config in configs
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
     else:
-        print("❌ 자동매매 설정 조회 실패:", response.json())
+        print("❌ 자동매매 설정 조회 실패:", _loads(response.content))
 
-def test_get_user_trading_configs():
-    """사용자별 자동매매 설정 조회"""
-    user_id = "test_user_001"
-    response = requests.get(f"{BASE_URL}/trading-configs/{user_id}")
+def show_user_trading_configs(response):
+    if skipped_missing_api(response):
+        return
     if response.status_code == 200:
-        configs = response.json()
-        print(f"✅ 사용자 '{user_id}' 설정 조회 성공: {len(configs)}개")
-        for config in configs:
-            print(f"  - {config['stock_name']}: {config['trading_mode']} (피라미딩: {config['pyramiding_count']}회)")
+        configs = _loads(response.content)
+        lines = [f"✅ 사용자 '{TEST_USER_ID}' 설정 조회 성공: {len(configs)}개"]
+        lines.extend(
+            f"  - {config['stock_name']}: {config['trading_mode']} (피라미딩: {config['pyramiding_count']}회)"
+            for config in configs
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
     else:
-        print("❌ 사용자별 설정 조회 실패:", response.json())
+        print("❌ 사용자별 설정 조회 실패:", _loads(response.content))
+
+# 개별 엔드포인트 테스트 (디버깅용)
+async def check_health(client):
+    """헬스 체크 테스트"""
+    show_health(await client.get("/health"))
+
+async def check_get_all_stocks(client):
+    """전체 주식 목록 조회"""
+    show_all_stocks(await client.get("/stocks"))
 
-def main():
+async def check_create_stock(client):
+    """새로운 주식 종목 추가"""
+    show_create_stock(await client.post("/stocks", content=_dumps(NEW_STOCK), headers=JSON_HEADERS))
+
+async def check_get_stock_by_code(client):
+    """종목 코드로 조회"""
+    show_stock_by_code(await client.get("/stocks/code/005930"))
+
+async def check_update_stock(client):
+    """주식 정보 수정"""
+    show_update_stock(await client.put("/stocks/1", content=_dumps(UPDATED_STOCK), headers=JSON_HEADERS))
+
+async def check_create_trading_config(client):
+    """새로운 자동매매 설정 추가"""
+    show_create_trading_config(
+        await client.post("/trading-configs", content=_dumps(NEW_CONFIG), headers=JSON_HEADERS)
+    )
+
+async def check_get_all_trading_configs(client):
+    """모든 자동매매 설정 조회"""
+    show_all_trading_configs(await client.get("/trading-configs"))
+
+async def check_get_user_trading_configs(client):
+    """사용자별 자동매매 설정 조회"""
+    show_user_trading_configs(await client.get(f"/trading-configs/{TEST_USER_ID}"))
+
+# 부하 테스트: 자동매매 설정 생성 요청을 동시에 보냅니다.
+async def post_config(client, sem, i):
+    """i 번째 부하 테스트용 설정을 생성하고 응답 코드를 반환합니다."""
+    config = {
+        **NEW_CONFIG,
+        "stock_code": f"{i:06d}",
+        "stock_name": f"부하테스트{i}",
+        "user_id": f"load_user_{i % 10}",
+    }
+    async with sem:
+        response = await client.post("/trading-configs", content=_dumps(config), headers=JSON_HEADERS)
+    return response.status_code
+
+async def load_test_configs(client, n=100, concurrency=10):
+    """설정 n 개를 최대 concurrency 개씩 동시에 생성하고 처리량을 출력합니다."""
+    sem = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+    statuses = await asyncio.gather(*(post_config(client, sem, i) for i in range(n)))
+    elapsed = time.perf_counter() - start
+    ok = statuses.count(200)
+    print(f"🔥 부하 테스트: {ok}/{n}건 성공, 동시 {concurrency}, {elapsed:.2f}초 ({n / elapsed:.1f} req/s)")
+
+# main() 에서 /bulk 한 번으로 보낼 요청 순서: (먼저 출력할 제목, 메서드, 경로, 본문, 출력 함수)
+BULK_STEPS = [
+    (None, "GET", "/health", None, show_health),
+    (None, "GET", "/stocks", None, show_all_stocks),
+    (None, "POST", "/stocks", NEW_STOCK, show_create_stock),
+    (None, "GET", "/stocks/code/005930", None, show_stock_by_code),
+    (None, "PUT", "/stocks/1", UPDATED_STOCK, show_update_stock),
+    ("📊 최종 주식 목록:", "GET", "/stocks", None, show_all_stocks),
+    ("🤖 자동매매 설정 테스트 시작\n" + "=" * 40, "POST", "/trading-configs", NEW_CONFIG, show_create_trading_config),
+    (None, "GET", "/trading-configs", None, show_all_trading_configs),
+    (None, "GET", f"/trading-configs/{TEST_USER_ID}", None, show_user_trading_configs),
+]
+
+async def main():
     print("🚀 주식 API 테스트 시작\n")
-    
+
     try:
-        test_health()
-        print()
-        
-        test_get_all_stocks()
-        print()
-        
-        test_create_stock()
-        print()
-        
-        test_get_stock_by_code()
-        print()
-        
-        test_update_stock()
-        print()
-        
-        print("📊 최종 주식 목록:")
-        test_get_all_stocks()
-        print()
-        
-        print("🤖 자동매매 설정 테스트 시작")
-        print("=" * 40)
-        
-        test_create_trading_config()
-        print()
-        
-        test_get_all_trading_configs()
-        print()
-        
-        test_get_user_trading_configs()
-        
-    except requests.exceptions.ConnectionError:
+        async with httpx.AsyncClient(base_url=BASE_URL) as client:
+            # 모든 요청을 /bulk 한 번의 왕복으로 보내고 결과를 순서대로 출력합니다.
+            calls = [
+                {"method": method, "path": path, "body": body}
+                for _, method, path, body, _ in BULK_STEPS
+            ]
+            response = await client.post("/bulk", content=_dumps(calls), headers=JSON_HEADERS)
+            if response.status_code == 404:
+                # /bulk 를 지원하지 않는 서버이면 요청을 하나씩 보냅니다.
+                results = []
+                for _, method, path, body, _ in BULK_STEPS:
+                    content = _dumps(body) if body is not None else None
+                    single = await client.request(method, path, content=content, headers=JSON_HEADERS)
+                    results.append((single.status_code, single.content))
+            else:
+                response.raise_for_status()
+                results = [
+                    (result["status"], _dumps(result["body"]))
+                    for result in _loads(response.content)
+                ]
+
+            for (title, *_, show), (status, content) in zip(BULK_STEPS, results):
+                if title:
+                    print(title)
+                show(httpx.Response(status, content=content))
+                print()
+
+            if LOAD_TEST:
+                await load_test_configs(client)
+
+    except httpx.ConnectError:
         print("❌ 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요.")
         print("서버 실행: python main.py")
 
 if __name__ == "__main__":
-    main()
+    try:
+        import uvloop  # libuv 기반 이벤트 루프 (부하 테스트 처리량 향상)
+    except ImportError:  # Windows 등 uvloop 미지원 환경은 기본 루프 사용
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
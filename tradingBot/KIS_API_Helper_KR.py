@@ -381,10 +381,12 @@ def GetBalance():
 
         # 호출
         res = requests.get(URL, headers=headers, params=params)
-        #pprint.pprint(res.json())
-        if res.status_code == 200 and res.json()["rt_cd"] == '0':
+        #응답 본문은 한 번만 파싱해서 재사용!
+        resData = res.json() if res.status_code == 200 else None
+        #pprint.pprint(resData)
+        if resData is not None and resData["rt_cd"] == '0':
 
-            result = res.json()['output2'][0]
+            result = resData['output2'][0]
             #pprint.pprint(result)
 
             balanceDict = dict()
@@ -419,7 +421,7 @@ def GetBalance():
 
         else:
             print("Error Code : " + str(res.status_code) + " | " + res.text)
-            return res.json()["msg_cd"]
+            return (resData if resData is not None else res.json())["msg_cd"]
         
 
 
@@ -465,10 +467,12 @@ def GetBalanceIRP():
 
     # 호출
     res = requests.get(URL, headers=headers, params=params)
-    #pprint.pprint(res.json())
-    if res.status_code == 200 and res.json()["rt_cd"] == '0':
+    #응답 본문은 한 번만 파싱해서 재사용!
+    resData = res.json() if res.status_code == 200 else None
+    #pprint.pprint(resData)
+    if resData is not None and resData["rt_cd"] == '0':
 
-        result = res.json()['output2'][0]
+        result = resData['output2'][0]
 
         #pprint.pprint(result)
 
@@ -496,13 +500,15 @@ def GetBalanceIRP():
 
     else:
         print("Error Code : " + str(res.status_code) + " | " + res.text)
-        return res.json()["msg_cd"]
+        return (resData if resData is not None else res.json())["msg_cd"]
 
 
 
 
 #한국 보유 주식 리스트!
-def GetMyStockList():
+#strict 가 True 이면 조회가 오류로 끝났을 때 (일부만 받은) 목록 대신 None 을 리턴합니다.
+#보유 종목이 없는 것과 조회 실패를 구분해야 하는 곳(자동매매 봇 등)에서 사용하세요!
+def GetMyStockList(strict=False):
 
     
 
@@ -524,6 +530,7 @@ def GetMyStockList():
     tr_cont = ""
     
     count = 0
+    Failed = False
 
     #드물지만 보유종목이 아주 많으면 한 번에 못가져 오므로 SeqKey를 이용해 연속조회를 하기 위한 반복 처리 
     while DataLoad:
@@ -630,11 +637,16 @@ def GetMyStockList():
 
             if res.json()["msg_cd"] == "EGW00123":
                 DataLoad = False
+                Failed = True
 
             count += 1
             if count > 10:
                 DataLoad = False
+                Failed = True
     
+    if strict == True and Failed == True:
+        return None
+
     return StockList
 
 
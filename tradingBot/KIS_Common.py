@@ -26,6 +26,7 @@ https://blog.naver.com/zacra
 import yaml
 
 import json
+import os
 import requests
 
 from datetime import datetime, timedelta
@@ -220,6 +221,11 @@ def GetUrlBase(dist="REAL"):
     return stock_info[key]
 
 
+# 토큰 유효 시간(응답에 expires_in 이 없을 때 사용)과 만료 전 재발급 여유 시간 (초)
+TOKEN_TTL_SECONDS = 23 * 3600
+TOKEN_REFRESH_MARGIN = 60
+
+
 # 토큰 값을 리퀘스트 해서 실제로 만들어서 파일에 저장하는 함수!! 첫번째 파라미터: "REAL" 실계좌, "VIRTUAL" 모의계좌
 def MakeToken(dist="REAL"):
 
@@ -235,15 +241,23 @@ def MakeToken(dist="REAL"):
     res = requests.post(URL, headers=headers, data=json.dumps(body))
 
     if res.status_code == 200:
-        my_token = res.json()["access_token"]
+        result = res.json()
+        my_token = result["access_token"]
 
         # 빈 딕셔너리를 선언합니다!
         dataDict = dict()
 
-        # 해당 토큰을 파일로 저장해 둡니다!
+        # 해당 토큰을 만료 시각(초)과 함께 파일로 저장해 둡니다!
         dataDict["authorization"] = my_token
-        with open(GetTokenPath(dist), "w") as outfile:
+        dataDict["exp"] = time.time() + int(result.get("expires_in", TOKEN_TTL_SECONDS))
+
+        # 토큰은 인증 정보이므로 0600 권한 임시 파일에 쓴 뒤 교체합니다. (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)
+        token_path = GetTokenPath(dist)
+        tmp_path = token_path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as outfile:
             json.dump(dataDict, outfile)
+        os.replace(tmp_path, token_path)
 
         print("TOKEN : ", my_token)
 
@@ -254,8 +268,12 @@ def MakeToken(dist="REAL"):
         return "FAIL"
 
 
-# 파일에 저장된 토큰값을 읽는 함수.. 만약 파일이 없다면 MakeToken 함수를 호출한다!
-def GetToken(dist="REAL"):
+# 파일에 저장된 토큰값을 읽는 함수.. 만약 파일이 없거나 만료가 임박했다면 MakeToken 함수를 호출한다!
+# force_refresh 가 True 이면 저장된 토큰을 무시하고 새로 발급합니다.
+def GetToken(dist="REAL", force_refresh=False):
+
+    if force_refresh:
+        return MakeToken(dist)
 
     # 빈 딕셔너리를 선언합니다!
     dataDict = dict()
@@ -266,6 +284,10 @@ def GetToken(dist="REAL"):
         with open(GetTokenPath(dist), "r") as json_file:
             dataDict = json.load(json_file)
 
+        # 만료 시각이 기록된 토큰은 만료 1분 전부터 새로 발급합니다. (예전 파일은 그대로 사용)
+        if dataDict.get("exp", float("inf")) <= time.time() + TOKEN_REFRESH_MARGIN:
+            return MakeToken(dist)
+
         return dataDict["authorization"]
 
     except Exception as e:
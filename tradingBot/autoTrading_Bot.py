@@ -18,9 +18,16 @@ import sys
 import os
 import time
 import csv
+import atexit
+import logging
+import queue
+import signal
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from pytz import timezone
-import traceback
 import pprint
 
 # 현재 디렉토리에 tradingBot 모듈 추가 (현재 파일이 tradingBot 내부에 있으므로 상위 디렉토리 추가)
@@ -37,6 +44,185 @@ except ImportError as e:
     print("tradingBot 폴더의 파일들이 필요합니다.")
     sys.exit(1)
 
+# 봇 로그 파일 (AUTOTRADING_LOG_FILE 로 경로를 지정한 경우에만, 10MB 단위로 5개까지 보관)
+# cron 실행(script.sh)은 stdout 을 이미 로그 파일로 리다이렉트하므로 기본은 stdout 만 사용합니다.
+LOG_FILE = os.environ.get("AUTOTRADING_LOG_FILE")
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+# 로그는 큐에 넣기만 하고 화면/파일 출력은 백그라운드 스레드가 처리 (매매 흐름을 막지 않음)
+logger = logging.getLogger("autoTrading_Bot")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue()
+logger.addHandler(QueueHandler(_log_queue))
+
+_log_handlers = [logging.StreamHandler(sys.stdout)]
+if LOG_FILE:
+    _file_handler = RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    _file_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    )
+    _log_handlers.append(_file_handler)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # 다른 종료 처리 뒤에 실행되어 남은 로그까지 출력
+
+# 한국 시간대 (호출마다 timezone() 조회하지 않도록 한 번만 생성)
+_KST = timezone("Asia/Seoul")
+
+# 장 운영 시간 (자정부터 분 단위): 09:00 ~ 15:30
+MARKET_OPEN_MINUTE = 9 * 60
+MARKET_CLOSE_MINUTE = 15 * 60 + 30
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 으로 대체 (느리지만 결과는 같음)
+    orjson = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        """객체를 파일 저장용 JSON bytes (indent=2) 로 직렬화합니다."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        """객체를 파일 저장용 JSON bytes (indent=2) 로 직렬화합니다."""
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+# 거래 로그 파일 쓰기 버퍼 크기와 flush 주기 (행 수)
+TRADE_LOG_BUFFER_SIZE = 1 << 16
+TRADE_LOG_FLUSH_EVERY = 16
+
+# 잔고/보유주식 조회 결과 재사용 시간 (초). 매수/매도 주문 후에는 바로 무효화됩니다.
+ACCOUNT_CACHE_TTL = 5
+
+# 잔고 조회 결과 중 숫자로 변환해 두는 금액 필드
+BALANCE_NUMERIC_KEYS = ("TotalMoney", "StockMoney", "StockRevenue", "RemainMoney")
+
+# 현재가 동시 조회 스레드 수와 계좌 모드별 초당 API 호출 한도 (모의계좌는 초당 2건)
+PRICE_FETCH_WORKERS = 8
+API_CALLS_PER_SECOND = {"REAL": 15, "VIRTUAL": 2}
+
+# 초당 거래건수 초과 응답 코드와 그때 속도를 낮춰 다시 시도하는 횟수
+RATE_LIMIT_ERROR_CODE = "EGW00201"
+RATE_LIMIT_RETRIES = 2
+
+# ATR 계산 결과 재사용 시간 (초). 일봉 기준이라 장중에 거의 바뀌지 않습니다.
+ATR_CACHE_TTL = 300
+
+# 텔레그램 메시지 최대 길이 (API 한도 4096자, 여유를 둠)
+TELEGRAM_MAX_LENGTH = 4000
+
+# 매수 이력 파일 최소 저장 간격 (초). 그 사이 변경분은 모아서 다음 저장 또는 종료 시 기록합니다.
+HISTORY_FLUSH_INTERVAL = 5
+
+# 거래 로그 파일 헤더
+TRADE_LOG_HEADERS = (
+    "timestamp",
+    "stock_code",
+    "stock_name",
+    "action",
+    "price",
+    "quantity",
+    "amount",
+    "entry_type",
+    "reason",
+    "avg_price",
+    "total_quantity",
+    "profit_loss",
+    "profit_loss_percent",
+    "trading_mode",
+    "stop_loss",
+    "take_profit",
+    "pyramiding_count",
+    "entry_point",
+)
+
+# 거래 요약 파일 헤더
+SUMMARY_HEADERS = (
+    "stock_code",
+    "stock_name",
+    "first_entry_date",
+    "last_exit_date",
+    "total_buy_amount",
+    "total_sell_amount",
+    "total_profit_loss",
+    "profit_loss_percent",
+    "max_drawdown",
+    "holding_days",
+    "entry_count",
+    "exit_count",
+    "trading_mode",
+    "win_rate",
+    "avg_holding_days",
+    "max_profit_percent",
+    "final_status",
+)
+
+
+def _config_value(config, key, default):
+    """설정 값 조회 (키가 없거나 API 에서 null 로 저장된 경우 기본값, 0 은 그대로 사용)"""
+    value = config.get(key)
+    return default if value is None else value
+
+
+class _Comma:
+    """천 단위 구분 숫자 로그 인자 (로그가 실제로 출력될 때만 문자열로 변환)"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return format(self.value, ",.0f")
+
+
+class RateLimiter:
+    """
+    여러 스레드가 공유하는 호출 속도 제한 (호출 사이 최소 간격 보장)
+
+    초당 거래건수 초과 응답을 받으면 간격을 두 배로 늘리고 (최대 1초),
+    성공할 때마다 설정된 간격으로 조금씩 되돌립니다.
+    """
+
+    def __init__(self, per_second):
+        self.base_interval = self.interval = 1.0 / per_second
+        self.max_interval = max(1.0, self.base_interval)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        """다음 호출 가능 시각까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self):
+        """호출 한도 초과: 간격을 늘리고 다음 호출을 그만큼 미룹니다."""
+        with self._lock:
+            self.interval = min(self.interval * 2, self.max_interval)
+            self._next_at = max(self._next_at, time.monotonic() + self.interval)
+
+    def recover(self):
+        """호출 성공: 늘어난 간격을 설정값 쪽으로 되돌립니다."""
+        if self.interval > self.base_interval:
+            with self._lock:
+                self.interval = max(self.base_interval, self.interval * 0.9)
+
 
 class AutoTradingBot:
     def __init__(self, mode="VIRTUAL"):
@@ -52,50 +238,179 @@ class AutoTradingBot:
         # 매수 이력 관리 (종목코드: {'entries': [...], 'avg_price': float, 'entry_count': int})
         self.trade_history = {}
         self.history_file = "trade_history.json"  # 통합된 파일명
+        self._history_dirty = False  # 파일에 아직 기록하지 않은 변경이 있는지
+        self._last_history_flush = 0.0
+        self._history_on_disk = None  # 마지막으로 읽거나 쓴 파일 내용 (bytes)
 
         # CSV 로그 파일 경로 (통합)
         self.trade_log_file = "trading_log.csv"
         self.summary_file = "trading_summary.csv"
+        # 요약 변경분은 저널에 한 줄씩 추가하고 CSV 는 장 마감/종료 시 한 번에 다시 씀
+        self.summary_journal_file = self.summary_file + ".jsonl"
+        # 일일 결산을 보낸 날짜 (크론으로 매분 새로 실행되므로 파일에 기록)
+        self.daily_summary_marker = "daily_summary_sent.txt"
+        self._summary_journal = None
+        self._summary_dirty = False
+
+        # 거래 로그는 파일을 열어 둔 채로 버퍼링해서 기록합니다. (init_csv_files 에서 열림)
+        self._trade_log_fh = None
+        self._trade_log_writer = None
+        self._trade_log_rows = 0
+        self._trade_row = [None] * len(TRADE_LOG_HEADERS)  # log_trade 가 재사용하는 행
+
+        # 거래 요약 계산용 메모리 인덱스 (처음 필요할 때 파일에서 한 번만 읽음)
+        self._summary_index = None  # 종목코드: 요약 행
+        self._trades_by_stock = None  # 종목코드: [거래 로그 행, ...]
+
+        # KIS 잔고/보유주식 조회 캐시 (조회 시각, 값)
+        self._balance_cache = (0.0, None)
+        self._my_stocks_cache = (0.0, None)
+        self._holdings = {}  # 종목코드: 보유주식 행 (get_my_stocks 결과로 갱신)
+
+        # 트레이딩 사이클 중에는 현재가/잔고/보유주식을 사이클 시작 시 한 번만 조회해 재사용
+        self._in_cycle = False
+        self._prices = {}  # 종목코드: 이번 사이클 현재가
+        self._rate_limiter = RateLimiter(API_CALLS_PER_SECOND.get(mode, 2))
+        self._atr_cache = {}  # (종목코드, 기간): (계산 시각, ATR)
+        self._pending_alerts = []  # 사이클 끝에 한 번에 보낼 거래 알림
+        self._ohlcv_cache = {}  # (종목코드, 봉 개수): (조회 날짜, DataFrame)
 
         # 계좌 모드 설정 (KIS API용)
         Common.SetChangeMode(mode)
-        print(f"[{datetime.now()}] 자동매매 봇 시작 - 모드: {mode}")
+        logger.info("[%s] 자동매매 봇 시작 - 모드: %s", datetime.now(), mode)
 
         # 설정 파일 로드
         self.load_configs()
 
         # 매수 이력 로드
         self.load_trade_history()
+        atexit.register(self.flush_trade_history)  # 종료 시 남은 변경분 기록
 
         # CSV 파일 초기화
         self.init_csv_files()
+        atexit.register(self.compact_trading_summary)  # 종료 시 요약 CSV 정리
 
         # 텔레그램 알림 초기화
         self.init_telegram()
 
-    def is_market_open(self):
+    def get_balance(self, ttl=ACCOUNT_CACHE_TTL):
+        """계좌 잔고 조회 (ttl 초 안에 다시 호출하면 이전 결과 재사용)"""
+        fetched_at, balance = self._balance_cache
+        if balance is None or (
+            not self._in_cycle and time.monotonic() - fetched_at > ttl
+        ):
+            self._rate_limiter.wait()
+            balance = KisKR.GetBalance()
+            if not isinstance(balance, dict):  # 오류 응답은 캐시하지 않음
+                return balance
+            # 금액 필드는 조회 시 한 번만 숫자로 변환
+            balance = {
+                key: float(value) if key in BALANCE_NUMERIC_KEYS else value
+                for key, value in balance.items()
+            }
+            self._balance_cache = (time.monotonic(), balance)
+        return balance
+
+    def get_my_stocks(self, ttl=ACCOUNT_CACHE_TTL):
+        """보유 주식 목록 조회 (ttl 초 안에 다시 호출하면 이전 결과 재사용)"""
+        fetched_at, my_stocks = self._my_stocks_cache
+        if my_stocks is None or (
+            not self._in_cycle and time.monotonic() - fetched_at > ttl
+        ):
+            # 조회 실패 시 일부만 받은 목록 대신 None 을 받아 '보유 없음'으로 캐시하지 않음
+            self._rate_limiter.wait()
+            my_stocks = KisKR.GetMyStockList(strict=True)
+            if not isinstance(my_stocks, list):  # 오류 응답은 캐시하지 않음
+                return my_stocks
+            self._my_stocks_cache = (time.monotonic(), my_stocks)
+            # 수량/평단가는 조회 시 한 번만 숫자로 변환해 둡니다.
+            self._holdings = {
+                stock["StockCode"]: {
+                    **stock,
+                    "StockAmt": int(stock["StockAmt"]),
+                    "StockAvgPrice": float(stock["StockAvgPrice"]),
+                }
+                for stock in my_stocks
+            }
+        return my_stocks
+
+    def get_holding(self, stock_code):
+        """보유 주식 행 조회 (미보유이면 None, StockAmt/StockAvgPrice 는 숫자)"""
+        my_stocks = self.get_my_stocks()
+        if not isinstance(my_stocks, list):
+            raise ValueError(f"보유 주식 조회 실패: {my_stocks}")
+        return self._holdings.get(stock_code)
+
+    def get_current_price(self, stock_code):
+        """현재가 조회 (트레이딩 사이클 중에는 사이클당 종목별 1회만 조회)"""
+        if self._in_cycle:
+            price = self._prices.get(stock_code)
+            if price is not None:
+                return price
+        # 호출 한도 초과 시 속도를 낮춰 다시 시도하는 _fetch_price 로 조회
+        price = self._fetch_price(stock_code)
+        if price is None:
+            raise ValueError(f"[{stock_code}] 현재가 조회 실패")
+        if self._in_cycle:
+            self._prices[stock_code] = price
+        return price
+
+    def _fetch_price(self, stock_code):
+        """속도 제한을 지켜 현재가 조회 (실패하면 None)"""
+        try:
+            for _ in range(RATE_LIMIT_RETRIES + 1):
+                self._rate_limiter.wait()
+                price = KisKR.GetCurrentPrice(stock_code)
+                if price != RATE_LIMIT_ERROR_CODE:
+                    self._rate_limiter.recover()
+                    return float(price)
+                # 호출 한도 초과: 속도를 낮춰 다시 시도
+                self._rate_limiter.backoff()
+            raise ValueError(f"호출 한도 초과 ({price})")
+        except Exception as e:
+            # 실패한 종목은 처리 시점에 다시 조회
+            logger.error("[%s] 현재가 조회 오류: %s", stock_code, e)
+            return None
+
+    def _map_concurrently(self, func, stock_codes):
+        """종목별 조회 함수를 스레드 풀에서 동시에 실행하고 결과를 순서대로 반환"""
+        if not stock_codes:
+            return []
+        with ThreadPoolExecutor(
+            max_workers=min(PRICE_FETCH_WORKERS, len(stock_codes))
+        ) as executor:
+            return list(executor.map(func, stock_codes))
+
+    def prefetch_prices(self, stock_codes):
+        """이번 사이클에 필요한 종목들의 현재가를 동시에 미리 조회"""
+        stock_codes = [code for code in stock_codes if code not in self._prices]
+        prices = self._map_concurrently(self._fetch_price, stock_codes)
+        for stock_code, price in zip(stock_codes, prices):
+            if price is not None:
+                self._prices[stock_code] = price
+
+    def prefetch_atr(self, stock_codes):
+        """Turtle 종목들의 일봉 조회와 ATR 계산을 동시에 미리 실행 (결과는 ATR 캐시에 저장)"""
+        self._map_concurrently(self.get_atr, list(stock_codes))
+
+    def invalidate_account_cache(self):
+        """주문으로 잔고/보유 수량이 바뀌었으므로 캐시를 비웁니다."""
+        self._balance_cache = (0.0, None)
+        self._my_stocks_cache = (0.0, None)
+
+    def is_market_open(self, now=None):
         """
         장 시간 체크
+        Args:
+            now: 기준 시각 (없으면 현재 한국 시간)
         Returns:
             bool: 장이 열려있으면 True
         """
-        try:
-            now = datetime.now(timezone("Asia/Seoul"))
-            current_time = now.strftime("%H%M")
-
-            # 평일 체크 (월~금)
-            if now.weekday() >= 5:  # 토요일(5), 일요일(6)
-                return False
-
-            # 장 시간: 09:00 ~ 15:30
-            if "0900" <= current_time <= "1530":
-                return True
-            else:
-                return False
-
-        except Exception as e:
-            print(f"시장 시간 체크 오류: {e}")
-            return False
+        if now is None:
+            now = datetime.now(_KST)
+        # 평일(월~금) 장 운영 시간이면 True (자정부터 분 단위로 비교)
+        minutes = now.hour * 60 + now.minute
+        return now.weekday() < 5 and MARKET_OPEN_MINUTE <= minutes <= MARKET_CLOSE_MINUTE
 
     def load_configs(self):
         """trading_configs.json 파일에서 설정 로드"""
@@ -104,42 +419,138 @@ class AutoTradingBot:
             config_path = os.path.join(
                 os.path.dirname(os.path.dirname(__file__)), "trading_configs.json"
             )
-            with open(config_path, "r", encoding="utf-8") as f:
-                all_configs = json.load(f)
+            with open(config_path, "rb") as f:
+                all_configs = json_loads(f.read())
 
-            # 활성화된 설정만 필터링
-            self.trading_configs = [
-                config for config in all_configs if config.get("is_active", False)
-            ]
-            print(f"[{datetime.now()}] 활성 설정 {len(self.trading_configs)}개 로드됨")
+            # 활성화된 설정만 필터링 (잘못된 설정은 그 설정만 건너뛰고 나머지는 계속 관리)
+            self.trading_configs = []
+            for config in all_configs:
+                if not config.get("is_active", False):
+                    continue
+                try:
+                    self.trading_configs.append(self.prepare_config(config))
+                except Exception as e:
+                    logger.error(
+                        "[%s] 설정 값 오류로 건너뜀: %s", config.get("stock_name", "Unknown"), e
+                    )
+            logger.info("[%s] 활성 설정 %s개 로드됨", datetime.now(), len(self.trading_configs))
 
         except Exception as e:
-            print(f"설정 파일 로드 오류: {e}")
+            logger.error("설정 파일 로드 오류: %s", e)
             self.trading_configs = []
 
+    def prepare_config(self, config):
+        """
+        매 틱마다 다시 계산할 필요 없는 값을 미리 계산해 config 에 저장 (키는 _ 로 시작)
+        - _amount_ratios: 차수별 투자 비율
+        - _max_loss_frac / _stop_loss_frac / _position_multiplier: Manual 포지션 크기 계산용
+        - _pyramiding_thresholds: 차수별 피라미딩 조건 (Manual: 상승률, Turtle: ATR 배수, 값 오류는 None)
+        - _trading_mode / _stop_loss / _take_profit / _entry_point: 기본값을 채운 청산·진입 설정
+        """
+        if "_amount_ratios" in config:
+            return config
+
+        # 피라미딩 차수별 비율 (설정이 없거나 잘못되면 1차에 전액)
+        pyramiding_count = config.get("pyramiding_count", 0)
+        positions = config.get("positions", [])
+        total_ratio = sum(positions[: pyramiding_count + 1]) if positions else 0
+        if pyramiding_count <= 0 or not positions or not total_ratio:
+            config["_amount_ratios"] = [1.0]
+        else:
+            config["_amount_ratios"] = [
+                ratio / total_ratio for ratio in positions[: pyramiding_count + 1]
+            ]
+
+        # 계좌잔고 * max_loss% / stop_loss% (값이 없거나 null 이면 기본값)
+        max_loss_frac = _config_value(config, "max_loss", 2.0) / 100  # 2% -> 0.02
+        stop_loss_frac = _config_value(config, "stop_loss", 8.0) / 100  # 8% -> 0.08
+        config["_max_loss_frac"] = max_loss_frac
+        config["_stop_loss_frac"] = stop_loss_frac
+        config["_position_multiplier"] = (
+            max_loss_frac / stop_loss_frac if stop_loss_frac else 0.0
+        )
+
+        # 청산/진입 조건에서 매 틱 쓰는 설정 (키가 없거나 null 이면 기본값 적용)
+        config["_trading_mode"] = _config_value(config, "trading_mode", "manual")
+        config["_stop_loss"] = _config_value(config, "stop_loss", 8.0)
+        config["_take_profit"] = _config_value(config, "take_profit", 24.0)
+        config["_entry_point"] = _config_value(config, "entry_point", 0)
+
+        # 피라미딩 엔트리 문자열("+5", "2" 등)은 로드 시 한 번만 파싱
+        is_manual = config["_trading_mode"] == "manual"
+        thresholds = []
+        for entry in config.get("pyramiding_entries", []):
+            entry_str = entry.strip()
+            try:
+                value = float(entry_str[1:] if entry_str.startswith("+") else entry_str)
+            except ValueError:
+                if entry_str:
+                    logger.error(
+                        "[%s] 피라미딩 엔트리 값 오류: %s", config.get("stock_name"), entry_str
+                    )
+                value = None
+            if value is not None and is_manual:
+                value /= 100  # 5% -> 0.05
+            thresholds.append(value)
+        config["_pyramiding_thresholds"] = thresholds
+        return config
+
     def load_trade_history(self):
         """매수 이력 로드"""
         try:
             if os.path.exists(self.history_file):
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    self.trade_history = json.load(f)
-                print(
-                    f"[{datetime.now()}] 매수 이력 로드됨: {len(self.trade_history)}개 종목"
+                with open(self.history_file, "rb") as f:
+                    self._history_on_disk = f.read()
+                self.trade_history = json_loads(self._history_on_disk)
+                # 이전 버전 파일에는 누적 매수금액이 없으므로 한 번 계산해 둡니다.
+                for history in self.trade_history.values():
+                    if "total_amount" not in history:
+                        history["total_amount"] = sum(
+                            entry["price"] * entry["quantity"]
+                            for entry in history["entries"]
+                        )
+                logger.info(
+                    "[%s] 매수 이력 로드됨: %s개 종목", datetime.now(), len(self.trade_history)
                 )
             else:
                 self.trade_history = {}
-                print(f"[{datetime.now()}] 새로운 매수 이력 파일 생성")
+                logger.info("[%s] 새로운 매수 이력 파일 생성", datetime.now())
         except Exception as e:
-            print(f"매수 이력 로드 오류: {e}")
+            logger.error("매수 이력 로드 오류: %s", e)
             self.trade_history = {}
 
-    def save_trade_history(self):
-        """매수 이력 저장"""
+    def save_trade_history(self, force=False):
+        """
+        매수 이력 저장 (HISTORY_FLUSH_INTERVAL 안의 연속 저장은 모아서 한 번만 기록)
+        트레이딩 사이클 중에는 표시만 해 두고 사이클이 끝날 때 기록합니다.
+        주문 직후처럼 바로 기록해야 할 때는 force=True 로 호출합니다.
+        """
+        self._history_dirty = True
+        if self._in_cycle and not force:
+            return
+        if (
+            force
+            or time.monotonic() - self._last_history_flush >= HISTORY_FLUSH_INTERVAL
+        ):
+            self.flush_trade_history()
+
+    def flush_trade_history(self):
+        """변경된 매수 이력을 임시 파일에 쓴 뒤 교체 (쓰기 도중 중단돼도 기존 파일 유지)"""
+        if not self._history_dirty:
+            return
         try:
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                json.dump(self.trade_history, f, ensure_ascii=False, indent=2)
+            data = json_dumps(self.trade_history)
+            # 파일 내용과 같으면 쓰지 않음
+            if data != self._history_on_disk:
+                tmp_path = self.history_file + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.history_file)
+                self._history_on_disk = data
+            self._history_dirty = False
+            self._last_history_flush = time.monotonic()
         except Exception as e:
-            print(f"매수 이력 저장 오류: {e}")
+            logger.error("매수 이력 저장 오류: %s", e)
 
     def update_trade_history(
         self, stock_code, stock_name, buy_price, buy_quantity, entry_type="initial"
@@ -152,6 +563,7 @@ class AutoTradingBot:
                     "entries": [],
                     "avg_price": 0.0,
                     "total_quantity": 0,
+                    "total_amount": 0.0,
                     "entry_count": 0,
                 }
 
@@ -165,28 +577,29 @@ class AutoTradingBot:
                 }
             )
 
-            # 평균 단가 및 총 수량 업데이트
+            # 평균 단가 및 총 수량 업데이트 (전체 이력을 다시 합산하지 않고 누적)
             history = self.trade_history[stock_code]
-            total_amount = sum(
-                entry["price"] * entry["quantity"] for entry in history["entries"]
-            )
-            total_quantity = sum(entry["quantity"] for entry in history["entries"])
+            history["total_amount"] += buy_price * buy_quantity
+            history["total_quantity"] += buy_quantity
+            total_quantity = history["total_quantity"]
 
             history["avg_price"] = (
-                total_amount / total_quantity if total_quantity > 0 else 0
+                history["total_amount"] / total_quantity if total_quantity > 0 else 0
             )
-            history["total_quantity"] = total_quantity
             history["entry_count"] = len(history["entries"])
 
             # 파일 저장
             self.save_trade_history()
 
-            print(
-                f"[{stock_name}] 매수 이력 업데이트 - 평균단가: {history['avg_price']:,.0f}원, 총수량: {total_quantity}주"
+            logger.info(
+                "[%s] 매수 이력 업데이트 - 평균단가: %s원, 총수량: %s주",
+                stock_name,
+                _Comma(history["avg_price"]),
+                total_quantity,
             )
 
         except Exception as e:
-            print(f"매수 이력 업데이트 오류: {e}")
+            logger.error("매수 이력 업데이트 오류: %s", e)
 
     def get_last_entry_price(self, stock_code):
         """마지막 매수가 조회"""
@@ -198,7 +611,7 @@ class AutoTradingBot:
                 return self.trade_history[stock_code]["entries"][-1]["price"]
             return None
         except Exception as e:
-            print(f"마지막 매수가 조회 오류: {e}")
+            logger.error("마지막 매수가 조회 오류: %s", e)
             return None
 
     def get_average_price(self, stock_code):
@@ -208,7 +621,7 @@ class AutoTradingBot:
                 return self.trade_history[stock_code]["avg_price"]
             return None
         except Exception as e:
-            print(f"평균 매수가 조회 오류: {e}")
+            logger.error("평균 매수가 조회 오류: %s", e)
             return None
 
     def get_entry_count(self, stock_code):
@@ -218,71 +631,47 @@ class AutoTradingBot:
                 return self.trade_history[stock_code]["entry_count"]
             return 0
         except Exception as e:
-            print(f"매수 횟수 조회 오류: {e}")
+            logger.error("매수 횟수 조회 오류: %s", e)
             return 0
 
     def init_csv_files(self):
         """CSV 파일 초기화 (헤더 생성)"""
         try:
-            # 거래 로그 파일 헤더
-            trade_log_headers = [
-                "timestamp",
-                "stock_code",
-                "stock_name",
-                "action",
-                "price",
-                "quantity",
-                "amount",
-                "entry_type",
-                "reason",
-                "avg_price",
-                "total_quantity",
-                "profit_loss",
-                "profit_loss_percent",
-                "trading_mode",
-                "stop_loss",
-                "take_profit",
-                "pyramiding_count",
-                "entry_point",
-            ]
-
-            # 거래 요약 파일 헤더
-            summary_headers = [
-                "stock_code",
-                "stock_name",
-                "first_entry_date",
-                "last_exit_date",
-                "total_buy_amount",
-                "total_sell_amount",
-                "total_profit_loss",
-                "profit_loss_percent",
-                "max_drawdown",
-                "holding_days",
-                "entry_count",
-                "exit_count",
-                "trading_mode",
-                "win_rate",
-                "avg_holding_days",
-                "max_profit_percent",
-                "final_status",
-            ]
-
             # 거래 로그 파일이 없으면 헤더와 함께 생성
             if not os.path.exists(self.trade_log_file):
                 with open(self.trade_log_file, "w", newline="", encoding="utf-8") as f:
                     writer = csv.writer(f)
-                    writer.writerow(trade_log_headers)
-                print(f"[{datetime.now()}] 거래 로그 파일 생성: {self.trade_log_file}")
+                    writer.writerow(TRADE_LOG_HEADERS)
+                logger.info("[%s] 거래 로그 파일 생성: %s", datetime.now(), self.trade_log_file)
 
             # 거래 요약 파일이 없으면 헤더와 함께 생성
             if not os.path.exists(self.summary_file):
                 with open(self.summary_file, "w", newline="", encoding="utf-8") as f:
                     writer = csv.writer(f)
-                    writer.writerow(summary_headers)
-                print(f"[{datetime.now()}] 거래 요약 파일 생성: {self.summary_file}")
+                    writer.writerow(SUMMARY_HEADERS)
+                logger.info("[%s] 거래 요약 파일 생성: %s", datetime.now(), self.summary_file)
+
+            self._open_trade_log()
 
         except Exception as e:
-            print(f"CSV 파일 초기화 오류: {e}")
+            logger.error("CSV 파일 초기화 오류: %s", e)
+
+    def _open_trade_log(self):
+        """거래 로그 파일을 추가 모드로 열어 두고 csv.writer 를 한 번만 만듭니다."""
+        self._trade_log_fh = open(
+            self.trade_log_file,
+            "a",
+            newline="",
+            encoding="utf-8",
+            buffering=TRADE_LOG_BUFFER_SIZE,
+        )
+        self._trade_log_writer = csv.writer(self._trade_log_fh)
+        atexit.register(self._trade_log_fh.close)  # 종료 시 남은 버퍼 기록
+
+    def flush_trade_log(self):
+        """버퍼에 남은 거래 로그를 파일에 기록합니다. (파일을 다시 읽기 전에 호출)"""
+        if self._trade_log_fh is not None:
+            self._trade_log_fh.flush()
 
     def log_trade(
         self,
@@ -311,59 +700,93 @@ class AutoTradingBot:
             pyramiding_count = config.get("pyramiding_count", "") if config else ""
             entry_point = config.get("entry_point", "") if config else ""
 
-            # 거래 로그 데이터
-            trade_data = [
-                timestamp,
-                stock_code,
+            # 거래 로그 데이터 (행 리스트를 새로 만들지 않고 재사용, 순서는 TRADE_LOG_HEADERS)
+            trade_data = self._trade_row
+            trade_data[0] = timestamp
+            trade_data[1] = stock_code
+            trade_data[2] = stock_name
+            trade_data[3] = action
+            trade_data[4] = price
+            trade_data[5] = quantity
+            trade_data[6] = amount
+            trade_data[7] = entry_type
+            trade_data[8] = reason
+            trade_data[9] = avg_price or ""
+            trade_data[10] = total_quantity or ""
+            trade_data[11] = profit_loss or ""
+            trade_data[12] = profit_loss_percent or ""
+            trade_data[13] = trading_mode
+            trade_data[14] = stop_loss
+            trade_data[15] = take_profit
+            trade_data[16] = pyramiding_count
+            trade_data[17] = entry_point
+
+            # CSV 파일에 추가 (열어 둔 파일에 버퍼링, TRADE_LOG_FLUSH_EVERY 행마다 flush)
+            if self._trade_log_writer is None:
+                self._open_trade_log()
+            self._trade_log_writer.writerow(trade_data)
+            self._trade_log_rows += 1
+            if self._trade_log_rows % TRADE_LOG_FLUSH_EVERY == 0:
+                self._trade_log_fh.flush()
+
+            # 메모리 인덱스가 로드되어 있으면 같은 행을 추가 (csv 로 읽은 값과 같은 문자열 형태)
+            if self._trades_by_stock is not None:
+                self._trades_by_stock[stock_code].append(
+                    dict(
+                        zip(
+                            TRADE_LOG_HEADERS,
+                            ("" if value is None else str(value) for value in trade_data),
+                        )
+                    )
+                )
+
+            logger.info(
+                "[%s] 거래 로그 기록: %s %s주 @ %s원",
                 stock_name,
                 action,
-                price,
                 quantity,
-                amount,
-                entry_type,
-                reason,
-                avg_price or "",
-                total_quantity or "",
-                profit_loss or "",
-                profit_loss_percent or "",
-                trading_mode,
-                stop_loss,
-                take_profit,
-                pyramiding_count,
-                entry_point,
-            ]
-
-            # CSV 파일에 추가
-            with open(self.trade_log_file, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(trade_data)
-
-            print(
-                f"[{stock_name}] 거래 로그 기록: {action} {quantity}주 @ {price:,.0f}원"
+                _Comma(price),
             )
 
         except Exception as e:
-            print(f"거래 로그 기록 오류: {e}")
+            logger.error("거래 로그 기록 오류: %s", e)
+
+    def _load_summary_index(self):
+        """요약 파일과 거래 로그를 한 번만 읽어 종목별 메모리 인덱스를 만듭니다.
+
+        이후 거래는 log_trade 가 인덱스에 바로 추가하므로 파일을 다시 읽지 않습니다.
+        """
+        self._summary_index = {}
+        if os.path.exists(self.summary_file):
+            with open(self.summary_file, "r", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._summary_index[row["stock_code"]] = row
+
+        # 이전 실행에서 CSV 에 반영되지 못한 저널이 있으면 이어서 적용
+        if os.path.exists(self.summary_journal_file):
+            with open(self.summary_journal_file, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        row = json_loads(line)
+                        self._summary_index[row["stock_code"]] = row
+                        self._summary_dirty = True
+
+        self._trades_by_stock = defaultdict(list)
+        self.flush_trade_log()
+        if os.path.exists(self.trade_log_file):
+            with open(self.trade_log_file, "r", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._trades_by_stock[row["stock_code"]].append(row)
 
     def update_trading_summary(self, stock_code):
         """거래 요약 파일 업데이트"""
         try:
-            # 기존 요약 데이터 읽기
-            summary_data = {}
-            if os.path.exists(self.summary_file):
-                with open(self.summary_file, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        summary_data[row["stock_code"]] = row
-
-            # 거래 로그에서 해당 종목 데이터 수집
-            trades = []
-            if os.path.exists(self.trade_log_file):
-                with open(self.trade_log_file, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row["stock_code"] == stock_code:
-                            trades.append(row)
+            if self._trades_by_stock is None:
+                self._load_summary_index()
+
+            # 기존 요약 데이터와 해당 종목 거래 내역 (메모리 인덱스)
+            summary_data = self._summary_index
+            trades = self._trades_by_stock.get(stock_code, [])
 
             if not trades:
                 return
@@ -373,20 +796,31 @@ class AutoTradingBot:
             stock_name = first_trade["stock_name"]
             trading_mode = first_trade["trading_mode"]
 
-            # 매수/매도 거래 분리
-            buy_trades = [t for t in trades if t["action"] == "BUY"]
-            sell_trades = [t for t in trades if t["action"] == "SELL"]
-
-            # 계산
-            first_entry_date = buy_trades[0]["timestamp"] if buy_trades else ""
-            last_exit_date = sell_trades[-1]["timestamp"] if sell_trades else ""
-
-            total_buy_amount = sum(
-                float(t["amount"]) for t in buy_trades if t["amount"]
-            )
-            total_sell_amount = sum(
-                float(t["amount"]) for t in sell_trades if t["amount"]
-            )
+            # 매수/매도 집계 (거래 내역을 한 번만 순회)
+            first_entry_date = ""
+            last_exit_date = ""
+            total_buy_amount = total_sell_amount = 0.0
+            total_buy_quantity = total_sell_quantity = 0.0
+            entry_count = exit_count = profitable_sells = 0
+            for t in trades:
+                if t["action"] == "BUY":
+                    if not entry_count:
+                        first_entry_date = t["timestamp"]
+                    entry_count += 1
+                    if t["amount"]:
+                        total_buy_amount += float(t["amount"])
+                    if t["quantity"]:
+                        total_buy_quantity += float(t["quantity"])
+                elif t["action"] == "SELL":
+                    last_exit_date = t["timestamp"]
+                    exit_count += 1
+                    if t["amount"]:
+                        total_sell_amount += float(t["amount"])
+                    if t["quantity"]:
+                        total_sell_quantity += float(t["quantity"])
+                    # 승률 계산용 (익절 거래 수)
+                    if t["profit_loss"] and float(t["profit_loss"]) > 0:
+                        profitable_sells += 1
 
             total_profit_loss = total_sell_amount - total_buy_amount
             profit_loss_percent = (
@@ -395,24 +829,15 @@ class AutoTradingBot:
                 else 0
             )
 
-            entry_count = len(buy_trades)
-            exit_count = len(sell_trades)
-
             # 보유일수 계산
             if first_entry_date and last_exit_date:
-                first_dt = datetime.strptime(first_entry_date, "%Y-%m-%d %H:%M:%S")
-                last_dt = datetime.strptime(last_exit_date, "%Y-%m-%d %H:%M:%S")
+                first_dt = datetime.fromisoformat(first_entry_date)
+                last_dt = datetime.fromisoformat(last_exit_date)
                 holding_days = (last_dt - first_dt).total_seconds() / 86400  # 일 단위
             else:
                 holding_days = 0
 
             # 현재 보유 상태 확인
-            total_buy_quantity = sum(
-                float(t["quantity"]) for t in buy_trades if t["quantity"]
-            )
-            total_sell_quantity = sum(
-                float(t["quantity"]) for t in sell_trades if t["quantity"]
-            )
             remaining_quantity = total_buy_quantity - total_sell_quantity
 
             if remaining_quantity > 0:
@@ -423,12 +848,7 @@ class AutoTradingBot:
                 final_status = "HOLDING"
 
             # 승률 계산 (익절 거래 / 전체 매도 거래)
-            profitable_sells = sum(
-                1
-                for t in sell_trades
-                if t["profit_loss"] and float(t["profit_loss"]) > 0
-            )
-            win_rate = (profitable_sells / len(sell_trades) * 100) if sell_trades else 0
+            win_rate = (profitable_sells / exit_count * 100) if exit_count else 0
 
             # 요약 데이터 업데이트
             summary_data[stock_code] = {
@@ -451,44 +871,55 @@ class AutoTradingBot:
                 "final_status": final_status,
             }
 
-            # CSV 파일 다시 쓰기
-            headers = [
-                "stock_code",
-                "stock_name",
-                "first_entry_date",
-                "last_exit_date",
-                "total_buy_amount",
-                "total_sell_amount",
-                "total_profit_loss",
-                "profit_loss_percent",
-                "max_drawdown",
-                "holding_days",
-                "entry_count",
-                "exit_count",
-                "trading_mode",
-                "win_rate",
-                "avg_holding_days",
-                "max_profit_percent",
-                "final_status",
-            ]
-
-            with open(self.summary_file, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                for data in summary_data.values():
-                    writer.writerow(data)
+            # 저널에 변경된 행만 추가 (CSV 는 compact_trading_summary 에서 다시 씀)
+            if self._summary_journal is None:
+                self._summary_journal = open(
+                    self.summary_journal_file, "a", encoding="utf-8"
+                )
+            self._summary_journal.write(
+                json.dumps(summary_data[stock_code], ensure_ascii=False) + "\n"
+            )
+            self._summary_journal.flush()
+            self._summary_dirty = True
 
-            print(f"[{stock_name}] 거래 요약 업데이트 완료")
+            logger.info("[%s] 거래 요약 업데이트 완료", stock_name)
 
         except Exception as e:
-            print(f"거래 요약 업데이트 오류: {e}")
-            import traceback
+            logger.error("거래 요약 업데이트 오류: %s", e)
+            logger.exception("거래 요약 업데이트 상세 오류")
 
-            traceback.print_exc()
+    def compact_trading_summary(self):
+        """메모리의 요약 데이터로 요약 CSV 를 다시 쓰고 저널을 비웁니다."""
+        if not self._summary_dirty:
+            return
+        try:
+            tmp_path = self.summary_file + ".tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=SUMMARY_HEADERS)
+                writer.writeheader()
+                for data in self._summary_index.values():
+                    writer.writerow(data)
+            os.replace(tmp_path, self.summary_file)
+
+            if self._summary_journal is not None:
+                self._summary_journal.close()
+                self._summary_journal = None
+            if os.path.exists(self.summary_journal_file):
+                os.remove(self.summary_journal_file)
+            self._summary_dirty = False
+        except Exception as e:
+            logger.error("거래 요약 파일 정리 오류: %s", e)
 
     def init_telegram(self):
-        """텔레그램 알림 초기화"""
+        """텔레그램 알림 초기화 (전송은 백그라운드 스레드에서 처리)"""
         try:
+            self._telegram_queue = queue.Queue()
+            self._telegram_thread = threading.Thread(
+                target=self._telegram_worker, daemon=True
+            )
+            self._telegram_thread.start()
+            atexit.register(self.close_telegram)  # 종료 전 남은 메시지 전송
+
             # 봇 시작 알림 # 매번 실행되서 OFF 최초 셋팅시 ON해서 테스트
             # self.send_telegram_message(
             #     f"🚀 자동매매 봇 시작\n\n"
@@ -496,23 +927,34 @@ class AutoTradingBot:
             #     f"📊 활성 종목: {len(self.trading_configs)}개\n"
             #     f"🕐 시작시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             # )
-            print(f"[{datetime.now()}] 텔레그램 알림 초기화 완료")
+            logger.info("[%s] 텔레그램 알림 초기화 완료", datetime.now())
         except Exception as e:
-            print(f"텔레그램 초기화 오류: {e}")
+            logger.error("텔레그램 초기화 오류: %s", e)
+
+    def _telegram_worker(self):
+        """큐에 쌓인 텔레그램 메시지를 순서대로 전송 (None 을 받으면 종료)"""
+        while True:
+            message = self._telegram_queue.get()
+            if message is None:
+                break
+            try:
+                # telegram_alert 모듈 사용
+                telegram_alert.SendMessage(message)
+                logger.info("[알림] 텔레그램 메시지 전송 완료")
+            except Exception as e:
+                logger.error("텔레그램 메시지 전송 오류: %s", e)
+
+    def close_telegram(self, timeout=30):
+        """남은 텔레그램 메시지를 모두 보낸 뒤 전송 스레드 종료"""
+        if self._telegram_thread.is_alive():
+            self._telegram_queue.put(None)
+            self._telegram_thread.join(timeout)
 
     def send_telegram_message(self, message, is_urgent=False):
-        """텔레그램 메시지 전송"""
-        try:
-            # telegram_alert 모듈 사용
-            telegram_alert.SendMessage(message)
-
-            if is_urgent:
-                print(f"[긴급 알림] {message}")
-            else:
-                print(f"[알림] 텔레그램 메시지 전송 완료")
-
-        except Exception as e:
-            print(f"텔레그램 메시지 전송 오류: {e}")
+        """텔레그램 메시지 전송 (큐에 넣고 바로 반환, 매매 흐름을 막지 않음)"""
+        self._telegram_queue.put(message)
+        if is_urgent:
+            logger.warning("[긴급 알림] %s", message)
 
     def send_trade_alert(
         self,
@@ -587,10 +1029,27 @@ class AutoTradingBot:
                         holding_text = f"{holding_days:.1f}일"
                     message += f"⏰ 보유기간: {holding_text}\n"
 
-            self.send_telegram_message(message, is_urgent=True)
+            if self._in_cycle:
+                # 사이클 중에는 모아 두었다가 flush_alerts 에서 한 번에 전송
+                logger.warning("[긴급 알림] %s", message)
+                self._pending_alerts.append(message)
+            else:
+                self.send_telegram_message(message, is_urgent=True)
 
         except Exception as e:
-            print(f"거래 알림 전송 오류: {e}")
+            logger.error("거래 알림 전송 오류: %s", e)
+
+    def flush_alerts(self):
+        """모아 둔 거래 알림을 메시지 길이 한도 안에서 묶어 전송"""
+        batch = ""
+        for message in self._pending_alerts:
+            if batch and len(batch) + len(message) + 2 > TELEGRAM_MAX_LENGTH:
+                self.send_telegram_message(batch)
+                batch = ""
+            batch = f"{batch}\n\n{message}" if batch else message
+        if batch:
+            self.send_telegram_message(batch)
+        self._pending_alerts = []
 
     def send_error_alert(self, error_type, stock_code, stock_name, error_message):
         """오류 알림"""
@@ -607,70 +1066,79 @@ class AutoTradingBot:
             self.send_telegram_message(message, is_urgent=True)
 
         except Exception as e:
-            print(f"오류 알림 전송 실패: {e}")
+            logger.error("오류 알림 전송 실패: %s", e)
+
+    def get_daily_summary_date(self):
+        """마지막으로 일일 결산을 보낸 날짜 (YYYY-MM-DD, 없으면 None)"""
+        try:
+            with open(self.daily_summary_marker, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_daily_summary_date(self, date_str):
+        """일일 결산을 보낸 날짜 기록"""
+        try:
+            with open(self.daily_summary_marker, "w", encoding="utf-8") as f:
+                f.write(date_str)
+        except Exception as e:
+            logger.error("일일 결산 기록 오류: %s", e)
 
     def send_daily_summary(self):
         """일일 결산 알림"""
+        self.compact_trading_summary()  # 장 마감 시 요약 CSV 정리
         try:
-            # 오늘 거래 기록 조회
+            # 오늘 거래 기록 조회 (메모리 인덱스 사용, 파일을 다시 읽지 않음)
             today = datetime.now().strftime("%Y-%m-%d")
-            trades_today = []
-
-            if os.path.exists(self.trade_log_file):
-                with open(self.trade_log_file, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row["timestamp"].startswith(today):
-                            trades_today.append(row)
-
-            if not trades_today:
+            if self._trades_by_stock is None:
+                self._load_summary_index()
+
+            # 통계 계산 (종목별 거래는 시간순이므로 뒤에서부터 오늘 거래만 확인)
+            buy_count = sell_count = profitable_trades = 0
+            total_buy_amount = total_sell_amount = realized_profit = 0.0
+            for trades in self._trades_by_stock.values():
+                for t in reversed(trades):
+                    if t["timestamp"] < today:
+                        break
+                    if not t["timestamp"].startswith(today):
+                        continue
+                    if t["action"] == "BUY":
+                        buy_count += 1
+                        if t["amount"]:
+                            total_buy_amount += float(t["amount"])
+                    elif t["action"] == "SELL":
+                        sell_count += 1
+                        if t["amount"]:
+                            total_sell_amount += float(t["amount"])
+                        if t["profit_loss"]:
+                            profit_loss = float(t["profit_loss"])
+                            realized_profit += profit_loss
+                            if profit_loss > 0:
+                                profitable_trades += 1
+
+            if not buy_count and not sell_count:
                 return
 
-            # 통계 계산
-            buy_trades = [t for t in trades_today if t["action"] == "BUY"]
-            sell_trades = [t for t in trades_today if t["action"] == "SELL"]
-
-            total_buy_amount = sum(
-                float(t["amount"]) for t in buy_trades if t["amount"]
-            )
-            total_sell_amount = sum(
-                float(t["amount"]) for t in sell_trades if t["amount"]
-            )
-
-            realized_profit = sum(
-                float(t["profit_loss"])
-                for t in sell_trades
-                if t["profit_loss"] and t["profit_loss"] != ""
-            )
-
-            profitable_trades = sum(
-                1
-                for t in sell_trades
-                if t["profit_loss"] and float(t["profit_loss"]) > 0
-            )
-
-            win_rate = (
-                (profitable_trades / len(sell_trades) * 100) if sell_trades else 0
-            )
+            win_rate = (profitable_trades / sell_count * 100) if sell_count else 0
 
             message = (
                 f"🌅 장 마감 - 일일 결산\n\n"
                 f"📅 거래일: {today}\n"
                 f"🏦 계좌: {self.mode}\n\n"
                 f"📊 오늘의 거래:\n"
-                f"  ✅ 매수: {len(buy_trades)}건\n"
-                f"  ✅ 매도: {len(sell_trades)}건\n\n"
+                f"  ✅ 매수: {buy_count}건\n"
+                f"  ✅ 매도: {sell_count}건\n\n"
                 f"💰 오늘 수익:\n"
                 f"  📈 실현손익: {realized_profit:+,.0f}원\n"
                 f"  💵 거래금액: {total_buy_amount:,.0f}원\n\n"
                 f"🏆 성과:\n"
-                f"  📊 승률: {win_rate:.1f}% ({profitable_trades}/{len(sell_trades)})\n"
+                f"  📊 승률: {win_rate:.1f}% ({profitable_trades}/{sell_count})\n"
             )
 
             self.send_telegram_message(message)
 
         except Exception as e:
-            print(f"일일 결산 알림 오류: {e}")
+            logger.error("일일 결산 알림 오류: %s", e)
 
     def calculate_position_size(self, config):
         """
@@ -679,20 +1147,26 @@ class AutoTradingBot:
         - Turtle 모드: (계좌잔고 * max_loss%) / (ATR * stop_loss배수 / 현재가)
         """
         try:
-            balance = KisKR.GetBalance()
-            total_money = float(balance["TotalMoney"])
-            trading_mode = config.get("trading_mode", "manual")
-            max_loss_percent = config.get("max_loss", 2.0) / 100  # 2% -> 0.02
+            self.prepare_config(config)
+            balance = self.get_balance()
+            total_money = balance["TotalMoney"]
+            trading_mode = config["_trading_mode"]
+            max_loss_percent = config["_max_loss_frac"]
 
             if trading_mode == "manual":
                 # % 기반 계산 (기존 방식)
-                stop_loss_percent = config.get("stop_loss", 8.0) / 100  # 8% -> 0.08
-                position_amount = total_money * max_loss_percent / stop_loss_percent
+                stop_loss_percent = config["_stop_loss_frac"]
+                position_amount = total_money * config["_position_multiplier"]
                 
-                print(
-                    f"[{config['stock_name']}] Manual 모드 - 계좌잔고: {total_money:,.0f}원, "
-                    f"위험허용: {max_loss_percent*100:.1f}%, 손절: {stop_loss_percent*100:.1f}%, "
-                    f"포지션: {position_amount:,.0f}원"
+                logger.info(
+                    "[%s] Manual 모드 - 계좌잔고: %s원, "
+                    "위험허용: %.1f%%, 손절: %.1f%%, "
+                    "포지션: %s원",
+                    config["stock_name"],
+                    _Comma(total_money),
+                    max_loss_percent * 100,
+                    stop_loss_percent * 100,
+                    _Comma(position_amount),
                 )
                 
             elif trading_mode == "turtle":
@@ -701,7 +1175,7 @@ class AutoTradingBot:
                 atr = self.get_atr(stock_code, 14)
                 
                 if atr:
-                    current_price = float(KisKR.GetCurrentPrice(stock_code))
+                    current_price = self.get_current_price(stock_code)
                     stop_loss_multiplier = config.get("stop_loss", 2.0)  # ATR 배수
                     
                     # 위험 허용 금액
@@ -713,32 +1187,46 @@ class AutoTradingBot:
                     # 포지션 크기 계산
                     position_amount = risk_amount / stop_loss_ratio
                     
-                    print(
-                        f"[{config['stock_name']}] Turtle 모드 - 계좌잔고: {total_money:,.0f}원, "
-                        f"위험허용: {risk_amount:,.0f}원, ATR: {atr:.1f}원, "
-                        f"손절폭: {stop_loss_amount:,.0f}원({stop_loss_ratio*100:.1f}%), "
-                        f"포지션: {position_amount:,.0f}원"
+                    logger.info(
+                        "[%s] Turtle 모드 - 계좌잔고: %s원, "
+                        "위험허용: %s원, ATR: %.1f원, "
+                        "손절폭: %s원(%.1f%%), "
+                        "포지션: %s원",
+                        config["stock_name"],
+                        _Comma(total_money),
+                        _Comma(risk_amount),
+                        atr,
+                        _Comma(stop_loss_amount),
+                        stop_loss_ratio * 100,
+                        _Comma(position_amount),
                     )
                 else:
                     # ATR 계산 실패시 manual 방식으로 fallback
-                    print(f"[{config['stock_name']}] ATR 계산 실패, Manual 방식으로 fallback")
+                    logger.error(
+                        "[%s] ATR 계산 실패, Manual 방식으로 fallback", config["stock_name"]
+                    )
                     stop_loss_percent = config.get("stop_loss", 2.0) / 100
                     position_amount = total_money * max_loss_percent / stop_loss_percent
                     
-                    print(
-                        f"[{config['stock_name']}] Fallback - 계좌잔고: {total_money:,.0f}원, "
-                        f"포지션: {position_amount:,.0f}원"
+                    logger.info(
+                        "[%s] Fallback - 계좌잔고: %s원, 포지션: %s원",
+                        config["stock_name"],
+                        _Comma(total_money),
+                        _Comma(position_amount),
                     )
             else:
                 # 알 수 없는 모드의 경우 manual 방식으로 처리
-                print(f"[{config['stock_name']}] 알 수 없는 매매모드: {trading_mode}, Manual 방식 적용")
-                stop_loss_percent = config.get("stop_loss", 8.0) / 100
-                position_amount = total_money * max_loss_percent / stop_loss_percent
+                logger.info(
+                    "[%s] 알 수 없는 매매모드: %s, Manual 방식 적용",
+                    config["stock_name"],
+                    trading_mode,
+                )
+                position_amount = total_money * config["_position_multiplier"]
 
             return position_amount
 
         except Exception as e:
-            print(f"포지션 크기 계산 오류: {e}")
+            logger.error("포지션 크기 계산 오류: %s", e)
             return 0
 
     def calculate_pyramiding_amounts(self, config, total_amount):
@@ -746,26 +1234,12 @@ class AutoTradingBot:
         피라미딩 수량 계산 - 각 차수별 증분 금액 반환
         """
         try:
-            pyramiding_count = config.get("pyramiding_count", 0)
-            positions = config.get("positions", [])
-
-            if pyramiding_count <= 0 or not positions:
-                return [total_amount]
-
-            # 포지션 비율 정규화
-            total_ratio = sum(positions[: pyramiding_count + 1])
-            amounts = []
-
-            for i in range(pyramiding_count + 1):
-                if i < len(positions):
-                    ratio = positions[i] / total_ratio
-                    amount = total_amount * ratio
-                    amounts.append(amount)
-
-            return amounts
+            # 포지션 비율은 prepare_config 에서 정규화해 둠
+            ratios = self.prepare_config(config)["_amount_ratios"]
+            return [total_amount * ratio for ratio in ratios]
 
         except Exception as e:
-            print(f"피라미딩 수량 계산 오류: {e}")
+            logger.error("피라미딩 수량 계산 오류: %s", e)
             return [total_amount]
 
     def get_current_entry_amount(self, config, total_amount):
@@ -778,8 +1252,11 @@ class AutoTradingBot:
 
             # 피라미딩 금액 배열 계산
             amounts = self.calculate_pyramiding_amounts(config, total_amount)
-            print(
-                f"[{config['stock_name']}] 현재 진입 차수: {current_entry_count}, 금액 배열: {amounts}"
+            logger.info(
+                "[%s] 현재 진입 차수: %s, 금액 배열: %s",
+                config["stock_name"],
+                current_entry_count,
+                amounts,
             )
             # 현재 진입 차수에 해당하는 금액 반환
             if current_entry_count < len(amounts):
@@ -789,30 +1266,52 @@ class AutoTradingBot:
                 return 0
 
         except Exception as e:
-            print(f"현재 진입 금액 계산 오류: {e}")
+            logger.error("현재 진입 금액 계산 오류: %s", e)
             return total_amount
 
+    def get_ohlcv(self, stock_code, limit):
+        """일봉 OHLCV 조회 (같은 날 같은 종목/개수는 한 번만 조회)"""
+        today = datetime.now(_KST).date()
+        cached = self._ohlcv_cache.get((stock_code, limit))
+        if cached and cached[0] == today:
+            return cached[1]
+        self._rate_limiter.wait()
+        df = Common.GetOhlcv("KR", stock_code, limit=limit)
+        if df is not None:
+            self._ohlcv_cache[(stock_code, limit)] = (today, df)
+        return df
+
     def get_atr(self, stock_code, period=14):
         """
-        ATR(Average True Range) 계산
+        ATR(Average True Range) 계산 - Wilder 방식 (ATR_CACHE_TTL 초 동안 결과 재사용)
         """
+        cached = self._atr_cache.get((stock_code, period))
+        if cached and time.monotonic() - cached[0] <= ATR_CACHE_TTL:
+            return cached[1]
         try:
-            df = Common.GetOhlcv("KR", stock_code, limit=period + 10)
+            df = self.get_ohlcv(stock_code, period + 10)
             if df is None or len(df) < period:
                 return None
 
-            # True Range 계산
-            df["h-l"] = df["high"] - df["low"]
-            df["h-pc"] = abs(df["high"] - df["close"].shift(1))
-            df["l-pc"] = abs(df["low"] - df["close"].shift(1))
-            df["tr"] = df[["h-l", "h-pc", "l-pc"]].max(axis=1)
+            # True Range 계산 (DataFrame 컬럼을 만들지 않고 NumPy 배열로 한 번에)
+            arr = df[["high", "low", "close"]].to_numpy(dtype=np.float64)
+            high, low, close = arr[:, 0], arr[:, 1], arr[:, 2]
+            prev_close = close[:-1]
+            tr = high - low  # 첫 봉은 전일 종가가 없으므로 고가-저가
+            tr[1:] = np.maximum(
+                tr[1:],
+                np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)),
+            )
 
-            # ATR 계산 (단순 이동평균)
-            atr = df["tr"].rolling(window=period).mean().iloc[-1]
-            return float(atr)
+            # ATR 계산 (Wilder 평활: alpha=1/period 지수이동평균, 마지막 값만 사용)
+            atr = float(
+                pd.Series(tr).ewm(alpha=1.0 / period, adjust=False).mean().iloc[-1]
+            )
+            self._atr_cache[(stock_code, period)] = (time.monotonic(), atr)
+            return atr
 
         except Exception as e:
-            print(f"ATR 계산 오류 [{stock_code}]: {e}")
+            logger.error("ATR 계산 오류 [%s]: %s", stock_code, e)
             return None
 
     def check_entry_conditions(self, config):
@@ -822,26 +1321,27 @@ class AutoTradingBot:
         try:
             stock_code = config["stock_code"]
             stock_name = config["stock_name"]
-            trading_mode = config.get("trading_mode", "manual")
 
             # 현재가 조회
-            current_price = float(KisKR.GetCurrentPrice(stock_code))
+            current_price = self.get_current_price(stock_code)
 
             # 보유 수량 확인
-            my_stocks = KisKR.GetMyStockList()
-            holding_amount = 0
-            for stock in my_stocks:
-                if stock["StockCode"] == stock_code:
-                    holding_amount = int(stock["StockAmt"])
-                    break
+            holding = self.get_holding(stock_code)
+            holding_amount = holding["StockAmt"] if holding else 0
 
             # 이미 보유 중인 경우 피라미딩 체크
             if holding_amount > 0:
-                print(
-                    f"[{stock_name}] 보유 중 - 현재가: {current_price:,.0f}원, 보유수량: {holding_amount:,.0f}주"
+                logger.info(
+                    "[%s] 보유 중 - 현재가: %s원, 보유수량: %s주",
+                    stock_name,
+                    _Comma(current_price),
+                    _Comma(holding_amount),
                 )
-                print(
-                    f"[{stock_name}] 피라미딩 조건 체크 - 현재가: {current_price:,.0f}원, 보유수량: {holding_amount:,.0f}주"
+                logger.info(
+                    "[%s] 피라미딩 조건 체크 - 현재가: %s원, 보유수량: %s주",
+                    stock_name,
+                    _Comma(current_price),
+                    _Comma(holding_amount),
                 )
                 return self.check_pyramiding_conditions(
                     config, current_price, holding_amount
@@ -850,23 +1350,30 @@ class AutoTradingBot:
             # 신규 진입 조건 체크
             # 여기서는 단순히 설정된 진입가격 기준으로 체크
             # 실제로는 더 복잡한 기술적 분석이 필요할 수 있음
-            entry_point = config.get("entry_point", 0)
-            print(
-                f"[{stock_name}] 현재가: {current_price:,.0f}원, 진입가: {entry_point:,.0f}원"
+            entry_point = self.prepare_config(config)["_entry_point"]
+            logger.info(
+                "[%s] 현재가: %s원, 진입가: %s원",
+                stock_name,
+                _Comma(current_price),
+                _Comma(entry_point),
             )
             if entry_point > 0 and current_price >= entry_point:
-                print(
-                    f"[{stock_name}] 신규 진입 조건 충족 - 현재가: {current_price:,.0f}원"
+                logger.info(
+                    "[%s] 신규 진입 조건 충족 - 현재가: %s원",
+                    stock_name,
+                    _Comma(current_price),
                 )
                 return True
             else:
-                print(
-                    f"[{stock_name}] 신규 진입 조건 불충족 - 현재가: {current_price:,.0f}원"
+                logger.info(
+                    "[%s] 신규 진입 조건 불충족 - 현재가: %s원",
+                    stock_name,
+                    _Comma(current_price),
                 )
                 return False  # 임시로 False 반환
 
         except Exception as e:
-            print(f"진입 조건 체크 오류 [{config['stock_name']}]: {e}")
+            logger.error("진입 조건 체크 오류 [%s]: %s", config["stock_name"], e)
             return False
 
     def check_pyramiding_conditions(self, config, current_price, holding_amount):
@@ -876,12 +1383,12 @@ class AutoTradingBot:
         try:
             stock_code = config["stock_code"]
             stock_name = config["stock_name"]
-            trading_mode = config.get("trading_mode", "manual")
+            trading_mode = self.prepare_config(config)["_trading_mode"]
             pyramiding_entries = config.get("pyramiding_entries", [])
             pyramiding_count = config.get("pyramiding_count", 0)
 
             if pyramiding_count <= 0 or not pyramiding_entries:
-                print(f"[{stock_name}] 피라미딩 설정 없음")
+                logger.info("[%s] 피라미딩 설정 없음", stock_name)
                 return False
 
             # 현재 매수 횟수 확인
@@ -889,15 +1396,18 @@ class AutoTradingBot:
 
             # 이미 최대 피라미딩 횟수를 초과한 경우
             if current_entry_count > pyramiding_count:
-                print(
-                    f"[{stock_name}] 피라미딩 횟수 초과 ({current_entry_count} > {pyramiding_count})"
+                logger.info(
+                    "[%s] 피라미딩 횟수 초과 (%s > %s)",
+                    stock_name,
+                    current_entry_count,
+                    pyramiding_count,
                 )
                 return False
 
             # 기준가 설정 (1차 진입시점)
             base_price = config.get("entry_point")
             if base_price is None:
-                print(f"[{stock_name}] 기준가 설정 실패")
+                logger.error("[%s] 기준가 설정 실패", stock_name)
                 return False
 
             # 다음 피라미딩 단계 확인
@@ -906,80 +1416,89 @@ class AutoTradingBot:
             )
 
             if next_entry_index >= len(pyramiding_entries):
-                print(
-                    f"[{stock_name}] 피라미딩 엔트리 설정 부족 ({next_entry_index} >= {len(pyramiding_entries)})"
+                logger.info(
+                    "[%s] 피라미딩 엔트리 설정 부족 (%s >= %s)",
+                    stock_name,
+                    next_entry_index,
+                    len(pyramiding_entries),
                 )
                 return False
 
-            entry_str = pyramiding_entries[next_entry_index].strip()
-            if not entry_str:
-                print(f"[{stock_name}] 피라미딩 엔트리 값 없음")
+            # prepare_config 에서 파싱해 둔 조건값
+            threshold = config["_pyramiding_thresholds"][next_entry_index]
+            if threshold is None:
+                entry_str = pyramiding_entries[next_entry_index].strip()
+                if not entry_str:
+                    logger.info("[%s] 피라미딩 엔트리 값 없음", stock_name)
+                elif trading_mode == "manual":
+                    logger.error("[%s] 피라미딩 엔트리 값 오류: %s", stock_name, entry_str)
+                else:
+                    logger.error("[%s] ATR 피라미딩 엔트리 값 오류: %s", stock_name, entry_str)
                 return False
 
             if trading_mode == "manual":
                 # % 기준 피라미딩
-                try:
-                    if entry_str.startswith("+"):
-                        threshold_percent = float(entry_str[1:]) / 100
-                    else:
-                        threshold_percent = float(entry_str) / 100
-
-                    # 기준가 대비 상승률 계산
-                    price_change_percent = (current_price - base_price) / base_price
+                threshold_percent = threshold
 
-                    print(
-                        f"[{stock_name}] 피라미딩 체크 - 기준가: {base_price:,.0f}원, 현재가: {current_price:,.0f}원"
-                    )
-                    print(
-                        f"[{stock_name}] 상승률: {price_change_percent*100:.2f}%, 목표: {threshold_percent*100:.2f}%"
-                    )
+                # 기준가 대비 상승률 계산
+                price_change_percent = (current_price - base_price) / base_price
 
-                    if price_change_percent >= threshold_percent:
-                        print(
-                            f"[{stock_name}] 피라미딩 조건 충족 - {next_entry_index + 1}차 매수"
-                        )
-                        return True
-                    else:
-                        print(f"[{stock_name}] 피라미딩 조건 불충족")
-                        return False
+                logger.info(
+                    "[%s] 피라미딩 체크 - 기준가: %s원, 현재가: %s원",
+                    stock_name,
+                    _Comma(base_price),
+                    _Comma(current_price),
+                )
+                logger.info(
+                    "[%s] 상승률: %.2f%%, 목표: %.2f%%",
+                    stock_name,
+                    price_change_percent * 100,
+                    threshold_percent * 100,
+                )
 
-                except ValueError:
-                    print(f"[{stock_name}] 피라미딩 엔트리 값 오류: {entry_str}")
+                if price_change_percent >= threshold_percent:
+                    logger.info(
+                        "[%s] 피라미딩 조건 충족 - %s차 매수", stock_name, next_entry_index + 1
+                    )
+                    return True
+                else:
+                    logger.info("[%s] 피라미딩 조건 불충족", stock_name)
                     return False
 
             else:  # turtle 모드
                 # ATR 기준 피라미딩
                 atr = self.get_atr(stock_code)
                 if atr is None:
-                    print(f"[{stock_name}] ATR 계산 실패")
+                    logger.error("[%s] ATR 계산 실패", stock_name)
                     return False
 
-                try:
-                    atr_multiplier = float(entry_str)
-                    threshold_price = base_price + (atr * atr_multiplier)
+                atr_multiplier = threshold
+                threshold_price = base_price + (atr * atr_multiplier)
 
-                    print(
-                        f"[{stock_name}] ATR 피라미딩 체크 - 기준가: {base_price:,.0f}원, 현재가: {current_price:,.0f}원"
-                    )
-                    print(
-                        f"[{stock_name}] ATR: {atr:.2f}, 목표가: {threshold_price:,.0f}원"
-                    )
-
-                    if current_price >= threshold_price:
-                        print(
-                            f"[{stock_name}] ATR 피라미딩 조건 충족 - {next_entry_index + 1}차 매수"
-                        )
-                        return True
-                    else:
-                        print(f"[{stock_name}] ATR 피라미딩 조건 불충족")
-                        return False
+                logger.info(
+                    "[%s] ATR 피라미딩 체크 - 기준가: %s원, 현재가: %s원",
+                    stock_name,
+                    _Comma(base_price),
+                    _Comma(current_price),
+                )
+                logger.info(
+                    "[%s] ATR: %.2f, 목표가: %s원",
+                    stock_name,
+                    atr,
+                    _Comma(threshold_price),
+                )
 
-                except ValueError:
-                    print(f"[{stock_name}] ATR 피라미딩 엔트리 값 오류: {entry_str}")
+                if current_price >= threshold_price:
+                    logger.info(
+                        "[%s] ATR 피라미딩 조건 충족 - %s차 매수", stock_name, next_entry_index + 1
+                    )
+                    return True
+                else:
+                    logger.info("[%s] ATR 피라미딩 조건 불충족", stock_name)
                     return False
 
         except Exception as e:
-            print(f"피라미딩 조건 체크 오류: {e}")
+            logger.error("피라미딩 조건 체크 오류: %s", e)
             return False
 
     def check_exit_conditions(self, config):
@@ -989,26 +1508,21 @@ class AutoTradingBot:
         try:
             stock_code = config["stock_code"]
             stock_name = config["stock_name"]
-            trading_mode = config.get("trading_mode", "manual")
-            stop_loss = config.get("stop_loss", 8.0)
-            take_profit = config.get("take_profit", 24.0)
+            self.prepare_config(config)
+            trading_mode = config["_trading_mode"]
+            stop_loss = config["_stop_loss"]
+            take_profit = config["_take_profit"]
 
             # 보유 수량 확인
-            my_stocks = KisKR.GetMyStockList()
-            holding_amount = 0
-            avg_price = 0
-
-            for stock in my_stocks:
-                if stock["StockCode"] == stock_code:
-                    holding_amount = int(stock["StockAmt"])
-                    avg_price = float(stock["StockAvgPrice"])
-                    break
+            holding = self.get_holding(stock_code)
+            holding_amount = holding["StockAmt"] if holding else 0
+            avg_price = holding["StockAvgPrice"] if holding else 0
 
             if holding_amount <= 0:
                 return False, None
 
             # 현재가 조회
-            current_price = float(KisKR.GetCurrentPrice(stock_code))
+            current_price = self.get_current_price(stock_code)
 
             # 수익률 계산
             profit_percent = ((current_price - avg_price) / avg_price) * 100
@@ -1034,7 +1548,7 @@ class AutoTradingBot:
             return False, None
 
         except Exception as e:
-            print(f"청산 조건 체크 오류 [{config['stock_name']}]: {e}")
+            logger.error("청산 조건 체크 오류 [%s]: %s", config["stock_name"], e)
             return False, None
 
     def execute_buy_order(self, config, amount):
@@ -1044,17 +1558,21 @@ class AutoTradingBot:
         try:
             stock_code = config["stock_code"]
             stock_name = config["stock_name"]
-            current_price = float(KisKR.GetCurrentPrice(stock_code))
+            current_price = self.get_current_price(stock_code)
 
             # 매수 수량 계산 (원 -> 주)
             buy_quantity = int(amount / current_price)
 
             if buy_quantity <= 0:
-                print(f"[{stock_name}] 매수 수량이 0입니다. 투자금액: {amount:,.0f}원")
+                logger.info(
+                    "[%s] 매수 수량이 0입니다. 투자금액: %s원", stock_name, _Comma(amount)
+                )
                 return False
 
             # 시장가 매수 주문
+            self._rate_limiter.wait()
             result = KisKR.MakeBuyMarketOrder(stock_code, buy_quantity)
+            self.invalidate_account_cache()
 
             if result:
                 # 매수 이력 업데이트
@@ -1064,15 +1582,20 @@ class AutoTradingBot:
                     if current_entry_count == 0
                     else f"pyramiding_{current_entry_count}"
                 )
+                reason = "신규진입" if entry_type == "initial" else f"{entry_type} 매수"
 
                 self.update_trade_history(
                     stock_code, stock_name, current_price, buy_quantity, entry_type
                 )
+                # 주문이 이미 나갔으므로 사이클 종료를 기다리지 않고 바로 기록
+                # (중간에 강제 종료되면 다음 실행이 같은 종목을 신규진입으로 다시 매수함)
+                self.save_trade_history(force=True)
 
-                # CSV 거래 로그 기록
-                avg_price = self.get_average_price(stock_code)
+                # CSV 거래 로그 기록 (갱신된 이력에서 한 번만 조회)
+                history = self.trade_history.get(stock_code, {})
+                avg_price = history.get("avg_price")
                 total_quantity = (
-                    self.get_entry_count(stock_code) * buy_quantity
+                    history.get("entry_count", 0) * buy_quantity
                 )  # 간단 계산
 
                 self.log_trade(
@@ -1083,9 +1606,7 @@ class AutoTradingBot:
                     quantity=buy_quantity,
                     amount=amount,
                     entry_type=entry_type,
-                    reason=(
-                        "신규진입" if entry_type == "initial" else f"{entry_type} 매수"
-                    ),
+                    reason=reason,
                     avg_price=avg_price,
                     total_quantity=total_quantity,
                     config=config,
@@ -1103,15 +1624,16 @@ class AutoTradingBot:
                     quantity=buy_quantity,
                     amount=amount,
                     entry_type=entry_type,
-                    reason=(
-                        "신규진입" if entry_type == "initial" else f"{entry_type} 매수"
-                    ),
+                    reason=reason,
                     avg_price=avg_price,
                     total_quantity=total_quantity,
                 )
 
-                print(
-                    f"[{stock_name}] 매수 주문 성공 - 수량: {buy_quantity}주, 금액: {amount:,.0f}원"
+                logger.info(
+                    "[%s] 매수 주문 성공 - 수량: %s주, 금액: %s원",
+                    stock_name,
+                    buy_quantity,
+                    _Comma(amount),
                 )
                 return True
             else:
@@ -1122,7 +1644,7 @@ class AutoTradingBot:
                     stock_name=stock_name,
                     error_message="시장가 매수 주문이 실패했습니다",
                 )
-                print(f"[{stock_name}] 매수 주문 실패")
+                logger.error("[%s] 매수 주문 실패", stock_name)
                 return False
 
         except Exception as e:
@@ -1133,7 +1655,7 @@ class AutoTradingBot:
                 stock_name=config.get("stock_name", ""),
                 error_message=str(e),
             )
-            print(f"매수 주문 오류 [{config['stock_name']}]: {e}")
+            logger.error("매수 주문 오류 [%s]: %s", config["stock_name"], e)
             return False
 
     def execute_sell_order(self, config, reason=""):
@@ -1145,34 +1667,31 @@ class AutoTradingBot:
             stock_name = config["stock_name"]
 
             # 보유 수량 확인
-            my_stocks = KisKR.GetMyStockList()
-            holding_amount = 0
-
-            for stock in my_stocks:
-                if stock["StockCode"] == stock_code:
-                    holding_amount = int(stock["StockAmt"])
-                    break
+            holding = self.get_holding(stock_code)
+            holding_amount = holding["StockAmt"] if holding else 0
 
             if holding_amount <= 0:
                 return False
 
             # 시장가 매도 주문
+            self._rate_limiter.wait()
             result = KisKR.MakeSellMarketOrder(stock_code, holding_amount)
+            self.invalidate_account_cache()
 
             if result:
                 # 현재가 및 수익 계산
-                current_price = float(KisKR.GetCurrentPrice(stock_code))
+                current_price = self.get_current_price(stock_code)
                 sell_amount = current_price * holding_amount
 
-                # 평균 매수가 조회
-                avg_price = self.get_average_price(stock_code)
+                # 매수 이력 (전량 매도이므로 꺼내서 초기화) 및 평균 매수가
+                history = self.trade_history.pop(stock_code, None)
+                avg_price = history["avg_price"] if history else None
 
                 # 수익 계산
                 if avg_price:
-                    profit_loss = sell_amount - (avg_price * holding_amount)
-                    profit_loss_percent = (
-                        profit_loss / (avg_price * holding_amount)
-                    ) * 100
+                    cost_basis = avg_price * holding_amount  # 매수 원가
+                    profit_loss = sell_amount - cost_basis
+                    profit_loss_percent = (profit_loss / cost_basis) * 100
                 else:
                     profit_loss = 0
                     profit_loss_percent = 0
@@ -1194,21 +1713,17 @@ class AutoTradingBot:
                     config=config,
                 )
 
-                # 매수 이력 초기화 (전량 매도)
-                if stock_code in self.trade_history:
-                    del self.trade_history[stock_code]
-                    self.save_trade_history()
+                # 매수 이력 초기화 (전량 매도) - 주문이 나갔으므로 바로 기록
+                if history is not None:
+                    self.save_trade_history(force=True)
 
                 # 거래 요약 업데이트
                 self.update_trading_summary(stock_code)
 
-                # 보유기간 계산
+                # 보유기간 계산 (첫 매수 시점 기준)
                 holding_days = None
-                if (
-                    stock_code in self.trade_history
-                    and self.trade_history[stock_code]["entries"]
-                ):
-                    first_entry = self.trade_history[stock_code]["entries"][0]
+                if history and history["entries"]:
+                    first_entry = history["entries"][0]
                     first_time = datetime.fromisoformat(first_entry["timestamp"])
                     holding_days = (datetime.now() - first_time).total_seconds() / 86400
 
@@ -1229,11 +1744,17 @@ class AutoTradingBot:
                     holding_days=holding_days,
                 )
 
-                print(
-                    f"[{stock_name}] 매도 주문 성공 - 수량: {holding_amount}주, 사유: {reason}"
+                logger.info(
+                    "[%s] 매도 주문 성공 - 수량: %s주, 사유: %s",
+                    stock_name,
+                    holding_amount,
+                    reason,
                 )
-                print(
-                    f"[{stock_name}] 수익: {profit_loss:,.0f}원 ({profit_loss_percent:.2f}%)"
+                logger.info(
+                    "[%s] 수익: %s원 (%.2f%%)",
+                    stock_name,
+                    _Comma(profit_loss),
+                    profit_loss_percent,
                 )
                 return True
             else:
@@ -1244,7 +1765,7 @@ class AutoTradingBot:
                     stock_name=stock_name,
                     error_message="시장가 매도 주문이 실패했습니다",
                 )
-                print(f"[{stock_name}] 매도 주문 실패")
+                logger.error("[%s] 매도 주문 실패", stock_name)
                 return False
 
         except Exception as e:
@@ -1255,7 +1776,7 @@ class AutoTradingBot:
                 stock_name=config.get("stock_name", ""),
                 error_message=str(e),
             )
-            print(f"매도 주문 오류 [{config['stock_name']}]: {e}")
+            logger.error("매도 주문 오류 [%s]: %s", config["stock_name"], e)
             return False
 
     def run_trading_cycle(self):
@@ -1263,38 +1784,64 @@ class AutoTradingBot:
         1회 트레이딩 사이클 실행
         """
         try:
-            print(f"\n[{datetime.now()}] === 트레이딩 사이클 시작 ===")
+            now = datetime.now(_KST)  # 사이클 기준 시각 (한 번만 조회)
+            logger.info("\n[%s] === 트레이딩 사이클 시작 ===", now)
 
             # 장 시간 체크
-            if not self.is_market_open():
-                print("장 시간이 아닙니다. 종료합니다.")
+            if not self.is_market_open(now):
+                logger.info("장 시간이 아닙니다. 종료합니다.")
                 return
 
+            # 이번 사이클 동안 쓸 계좌 정보와 현재가를 한 번만 조회
+            self._in_cycle = True
+            self._prices = {}
+            self._atr_cache.clear()
+            self._ohlcv_cache.clear()  # 당일 봉은 장중에 계속 바뀌므로 사이클마다 새로 조회
+            self.invalidate_account_cache()
+
             # 잔고 확인
-            balance = KisKR.GetBalance()
-            print("--------------내 보유 잔고---------------------")
-            pprint.pprint(balance)
-            print("--------------------------------------------")
+            balance = self.get_balance()
+            logger.info(
+                "--------------내 보유 잔고---------------------\n%s\n"
+                "--------------------------------------------",
+                pprint.pformat(balance),
+            )
             ##########################################################
-            print("--------------내 보유 주식---------------------")
+            logger.info("--------------내 보유 주식---------------------")
             # 그리고 현재 이 계좌에서 보유한 주식 리스트를 가지고 옵니다!
-            MyStockList = KisKR.GetMyStockList()
-            pprint.pprint(MyStockList)
-            print("--------------------------------------------")
+            MyStockList = self.get_my_stocks()
+            logger.info(
+                "%s\n--------------------------------------------",
+                pprint.pformat(MyStockList),
+            )
 
-            if balance is None or float(balance["TotalMoney"]) <= 0:
-                print("잔고가 부족합니다. 매매를 중단합니다.")
+            if balance is None or balance["TotalMoney"] <= 0:
+                logger.warning("잔고가 부족합니다. 매매를 중단합니다.")
+                return
+
+            # 보유 주식을 모르면 손절 누락이나 중복 신규진입이 생길 수 있으므로 중단
+            if not isinstance(MyStockList, list):
+                logger.error("보유 주식 조회 실패. 매매를 중단합니다.")
                 return
 
             # 각 설정에 대해 매매 로직 실행
-            print("매매대상 종목 수:", len(self.trading_configs))
+            logger.info("매매대상 종목 수: %d", len(self.trading_configs))
+            # 종목별 조회(현재가, Turtle 종목의 일봉/ATR)는 미리 동시에 처리하고
+            # 주문이 나가는 아래 루프는 계좌/이력 상태를 공유하므로 순서대로 실행합니다.
+            self.prefetch_prices(
+                dict.fromkeys(config["stock_code"] for config in self.trading_configs)
+            )
+            self.prefetch_atr(
+                dict.fromkeys(
+                    config["stock_code"]
+                    for config in self.trading_configs
+                    if self.prepare_config(config)["_trading_mode"] != "manual"
+                )
+            )
             for config in self.trading_configs:
                 try:
                     stock_name = config["stock_name"]
-                    print(f"\n[{stock_name}] 매매 체크 시작")
-
-                    # 100ms 딜레이 추가
-                    time.sleep(1)  # 500ms 딜레이
+                    logger.info("\n[%s] 매매 체크 시작", stock_name)
 
                     # 청산 조건 체크 (우선순위: 손절/익절)
                     should_exit, exit_reason = self.check_exit_conditions(config)
@@ -1316,21 +1863,25 @@ class AutoTradingBot:
                                 # 현재 피라미딩 차수에 맞는 금액으로 매수
                                 self.execute_buy_order(config, current_amount)
                             else:
-                                print(
-                                    f"[{config['stock_name']}] 피라미딩 한도 초과 또는 투자금액 부족"
+                                logger.info(
+                                    "[%s] 피라미딩 한도 초과 또는 투자금액 부족", config["stock_name"]
                                 )
 
                 except Exception as e:
-                    print(
-                        f"개별 종목 처리 오류 [{config.get('stock_name', 'Unknown')}]: {e}"
+                    logger.error(
+                        "개별 종목 처리 오류 [%s]: %s", config.get("stock_name", "Unknown"), e
                     )
 
-            # 장 마감 시간(15:30)에 일일 결산 알림
-            current_time = datetime.now().strftime("%H%M")
-            if current_time == "1530":
+            # 장 마감 시간(15:30) 사이클에서 하루 한 번 일일 결산 알림
+            today = now.strftime("%Y-%m-%d")
+            if (
+                now.hour * 60 + now.minute >= MARKET_CLOSE_MINUTE
+                and self.get_daily_summary_date() != today
+            ):
                 self.send_daily_summary()
+                self.set_daily_summary_date(today)
 
-            print(f"[{datetime.now()}] === 트레이딩 사이클 완료 ===\n")
+            logger.info("[%s] === 트레이딩 사이클 완료 ===\n", datetime.now())
 
         except Exception as e:
             # 시스템 오류 알림
@@ -1340,12 +1891,26 @@ class AutoTradingBot:
                 stock_name="시스템",
                 error_message=str(e),
             )
-            traceback.print_exc()
-            print(f"트레이딩 사이클 오류: {e}")
+            logger.exception("트레이딩 사이클 상세 오류")
+            logger.error("트레이딩 사이클 오류: %s", e)
+        finally:
+            self._in_cycle = False
+            self.flush_trade_history()
+            self.flush_alerts()
+
+
+def _exit_on_sigterm(signum, frame):
+    """
+    SIGTERM(cron/systemd/timeout 종료)을 SystemExit 으로 바꿉니다.
+    atexit 는 SIGTERM 에서는 실행되지 않으므로, 이렇게 해야 거래 로그 버퍼, 매수 이력,
+    요약 저널, 텔레그램 큐가 정상 종료와 같이 기록/전송됩니다.
+    """
+    sys.exit(128 + signum)
 
 
 def main():
     """메인 함수"""
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
     try:
         # 명령행 인수로 모드 설정
         mode = "VIRTUAL"  # 기본값
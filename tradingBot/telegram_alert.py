@@ -9,6 +9,7 @@ https://blog.naver.com/zacra/223622479916
 import telegram
 import asyncio
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,16 +19,38 @@ CHAT_ID = int(os.getenv('TELEGRAM_CHAT_ID'))
 
 bot = telegram.Bot(token=TOKEN)
 
+# 메시지 전송 전용 이벤트 루프 (백그라운드 스레드에서 계속 실행, bot 의 HTTP 연결 재사용)
+_loop = None
+_loop_lock = threading.Lock()
+_init_task = None
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="telegram_alert", daemon=True).start()
+    return _loop
+
+
 async def send_telegram_alert(msg):
+    global _init_task
+    # 첫 전송 때 한 번만 bot 초기화 (실패하면 다음 전송 때 다시 시도)
+    if _init_task is None:
+        _init_task = asyncio.ensure_future(bot.initialize())
+    try:
+        await _init_task
+    except Exception:
+        _init_task = None
+        raise
     await bot.send_message(chat_id=CHAT_ID, text=msg)
 
 
-def SendMessage(msg):
+def SendMessage(msg, timeout=30):
     try:
-        loop = asyncio.get_event_loop()  # 기존 이벤트 루프 가져오기
-        if loop.is_running():  # 이미 이벤트 루프가 실행 중인 경우
-            loop.create_task(send_telegram_alert(msg))  # 비동기 작업을 추가
-        else:
-            loop.run_until_complete(send_telegram_alert(msg))  # 새로운 이벤트 루프 실행
+        # 전송 루프에 작업을 넘기고 전송이 끝날 때까지 대기 (어느 스레드에서 호출해도 안전)
+        future = asyncio.run_coroutine_threadsafe(send_telegram_alert(msg), _get_loop())
+        future.result(timeout)
     except Exception as ex:
         print(ex)
\ No newline at end of file